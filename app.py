@@ -3,131 +3,149 @@ import pandas as pd
 import os
 import io
 from dotenv import load_dotenv
-import unicodedata
-import json
 
 # Load Environment Variables
 load_dotenv()
 
-from core import cyk_algorithm, convert_to_cnf, remove_epsilon_productions, remove_unit_productions
-from grammar import RULES_CFG
+from core import BitsetChart, LRUCache, build_parse_forest, extend_bitset_chart, source_backpointers
+from grammar import get_rules_cfg, grammar_fingerprint, load_compiled_grammar, load_lexicon_index
+from grammar.stemmer import bersihkan_dan_stem_bali, normalisasi_kalimat
+from grammar.lexicon_index import get_lexicon_path
 from ui import app_ui, styles
-from utils import stats_manager, batch_processor
+from utils import stats_manager, batch_processor, batch_jobs
 
 @st.cache_resource
 def prepare_grammars():
-    cfg_no_eps = remove_epsilon_productions(RULES_CFG)
-    cfg_strict = remove_unit_productions(cfg_no_eps)
-    cnf_strict = convert_to_cnf(cfg_strict)
-    cnf_viz = cfg_no_eps
+    # Grammar hasil normalisasi dibaca dari cache disk (dibangun ulang hanya kalau grammar berubah).
+    # cnf_strict menyimpan grammar asalnya → tree tetap memakai simbol CFG asli
+    cnf_strict = load_compiled_grammar()
+    cnf_viz = cnf_strict.source
     return cnf_strict, cnf_viz
 
+# Jumlah hasil parse yang disimpan untuk semua sesi di satu proses server
+PARSE_CACHE_SIZE = 2048
+
+@st.cache_resource
+def parse_result_cache():
+    # Satu LRU bersama (bukan per st.session_state): kalimat populer cukup di-parse sekali
+    return LRUCache(maxsize=PARSE_CACHE_SIZE)
+
 def run_cyk_cached(sentence: str):
-    cache_key = f"cyk__{sentence}"
-    if cache_key not in st.session_state:
-        cnf_strict, cnf_viz = prepare_grammars()
-        words = sentence.split()
-        is_valid, table, _ = cyk_algorithm(cnf_strict, words)
-        _, _, backpointers_viz = cyk_algorithm(cnf_viz, words)
-        st.session_state[cache_key] = {
-            "words": words,
-            "is_valid": is_valid,
-            "table": table,
-            "backpointers_viz": backpointers_viz,
+    cnf_strict, _ = prepare_grammars()
+    words = sentence.split()
+    cache = parse_result_cache()
+    cache_key = (grammar_fingerprint(), " ".join(words))
+
+    cached = cache.get(cache_key)
+    if cached is None:
+        # Saat mengetik kata baru di akhir kalimat, tabel kalimat sebelumnya (prefix)
+        # biasanya sudah ada di cache → cukup isi kolom kata yang baru
+        prefix_masks = None
+        for m in range(len(words) - 1, 0, -1):
+            prefix = cache.peek((cache_key[0], " ".join(words[:m])))
+            if prefix is not None:
+                prefix_masks = prefix[1]
+                break
+        # Satu kali parse; backpointer untuk tree diturunkan dari tabel yang sama
+        is_valid, chart = extend_bitset_chart(cnf_strict, prefix_masks, words)
+        backpointers_viz = source_backpointers(cnf_strict, words, chart)
+        # Yang disimpan: mask int per sel + backpointer sel yang dilalui tree saja
+        sparse_bp = {
+            (i, j): cell
+            for i, row in enumerate(backpointers_viz)
+            for j, cell in enumerate(row) if cell
         }
-    return st.session_state[cache_key]
+        # Jumlah tree per node (int saja) diisi forest saat count() pertama kali dipakai UI;
+        # forest & sel yang sudah di-decode tidak ikut di cache
+        cached = (is_valid, chart.masks, sparse_bp, {})
+        cache.put(cache_key, cached)
+
+    is_valid, masks, sparse_bp, parse_counts = cached
+    n = len(words)
+    # BitsetChart baru per request: set simbol di-decode saat sel dibaca, tidak ikut di cache
+    table = BitsetChart(cnf_strict, masks)
+    forest = (
+        build_parse_forest(cnf_strict, words, table, expand=False, counts=parse_counts)
+        if is_valid else None
+    )
+    return {
+        "words": words,
+        "is_valid": is_valid,
+        "table": table,
+        "backpointers_viz": [[sparse_bp.get((i, j), {}) for j in range(n)] for i in range(n)],
+        # Semua derivasi (packed); tree ke-N dibangun hanya saat dipilih di UI
+        "forest": forest,
+    }
 
-@st.cache_data
+@st.cache_resource
 def load_balinese_corpus():
-    file_path = "scraping/balinese_lexicon.json"
-    
-    if not os.path.exists(file_path):
-        st.error(f"⚠️ File corpus tidak ditemukan di: {file_path}")
-        return set() 
-        
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        kata_dasar_set = set()
-        
-        for kategori, isi_kategori in data.items():
-            if isinstance(isi_kategori, dict):
-                for kata in isi_kategori.keys():
-                    kata_dasar_set.add(kata.lower().strip())
-                    
-        return kata_dasar_set
+    # Index leksikon bersama (JSON hanya di-parse sekali per proses);
+    # `kata in index` = cek kata dasar, index.base_ends() = jalan trie untuk stemming
+    index = load_lexicon_index()
+    if not index.data:
+        st.error(f"⚠️ File corpus tidak ditemukan di: {get_lexicon_path()}")
+    return index
     
-def stem_kata_bali(kata, kamus_dasar):
-    """
-    Menganalisis 1 kata dan mencoba mengupas imbuhan bahasa Bali 
-    (Akhiran, Awalan, Gabungan, dan Nasalisasi) untuk mencari kata dasarnya.
-    """
-    kata_pengecualian = ["petang", "patang", "telung", "limang"]
-    if kata in kata_pengecualian or kata in kamus_dasar:
-        return kata, None
-
-    suffixes = ["ang", "ne", "in", "an", "a", "e"]
-    prefixes = ["ma", "ka", "pa", "sa", "di", "a"]
-    
-    for suf in suffixes:
-        if kata.endswith(suf):
-            k_dasar = kata[:-len(suf)]
-            if k_dasar in kamus_dasar:
-                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Hapus akhiran -{suf})"
-
-    for pref in prefixes:
-        if kata.startswith(pref):
-            k_dasar = kata[len(pref):]
-            if k_dasar in kamus_dasar:
-                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Hapus awalan {pref}-)"
-
-    for pref in prefixes:
-        for suf in suffixes:
-            if kata.startswith(pref) and kata.endswith(suf):
-                k_dasar = kata[len(pref):-len(suf)]
-                if k_dasar in kamus_dasar:
-                    return k_dasar, f"**{kata}** ➡️ {k_dasar} (Hapus {pref}- dan -{suf})"
-
-    if kata.startswith("ng"):
-        k_dasar = kata[2:] # Hapus 'ng'
-        if k_dasar in kamus_dasar:
-            return k_dasar, f"**{kata}** ➡️ {k_dasar} (Nasalisasi ng-)"
-            
-    if kata.startswith("ny"):
-        for huruf_asli in ['j', 'c', 's']:
-            k_dasar = huruf_asli + kata[2:]
-            if k_dasar in kamus_dasar:
-                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Nasalisasi ny- menjadi {huruf_asli}-)"
-                
-    if kata.startswith("m") and len(kata) > 2:
-        for huruf_asli in ['b', 'p']:
-            k_dasar = huruf_asli + kata[1:]
-            if k_dasar in kamus_dasar:
-                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Nasalisasi m- menjadi {huruf_asli}-)"
-                
-    if kata.startswith("n") and not kata.startswith("ny") and not kata.startswith("ng"):
-        for huruf_asli in ['t', 'd']:
-            k_dasar = huruf_asli + kata[1:]
-            if k_dasar in kamus_dasar:
-                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Nasalisasi n- menjadi {huruf_asli}-)"
-
-    return kata, None
+KATA_DASAR_CORPUS = load_balinese_corpus()
 
-def bersihkan_dan_stem_bali(kalimat, kamus_dasar):
-    kalimat = kalimat.replace(".", "").replace(",", "")
-    kata_kata = kalimat.split()
-    
-    hasil_bersih = []
-    log_perubahan = []
-    
-    for kata in kata_kata:
-        kata_dasar, catatan = stem_kata_bali(kata, kamus_dasar)
-        hasil_bersih.append(kata_dasar)
-        if catatan:
-            log_perubahan.append(catatan)
-            
-    return " ".join(hasil_bersih), log_perubahan
+@st.cache_resource
+def resume_batch_jobs():
+    # Sekali per proses server (dipanggil dari main, bukan saat import):
+    # job yang terputus (server restart) lanjut dari checkpoint
+    return batch_jobs.resume_jobs(KATA_DASAR_CORPUS, bersihkan_dan_stem_bali)
+
+JOB_STATUS_LABEL = {
+    "queued": "⏳ Antre",
+    "running": "⚙️ Berjalan",
+    "paused": "⏸️ Dijeda",
+    "done": "✅ Selesai",
+    "failed": "❌ Gagal",
+}
+
+@st.fragment(run_every=2)
+def render_batch_jobs():
+    # Di-refresh sendiri tiap 2 detik (hanya bagian ini, bukan seluruh halaman)
+    jobs = batch_jobs.list_jobs()
+    if not jobs:
+        return
+
+    st.markdown("#### 🗂️ Job Latar Belakang")
+    for job in jobs:
+        job_id = job["id"]
+        counts = job["counts"]
+        running = batch_jobs.is_running(job_id)
+        status = job["status"]
+        # status 'running' tanpa thread = job milik proses lain / menunggu resume
+        if status == "running" and not running:
+            status = "paused"
+
+        with st.container(border=True):
+            c_info, c_act, c_load, c_del = st.columns([5, 1, 1, 1])
+            c_info.markdown(
+                f"**{', '.join(job['files'])}** · {JOB_STATUS_LABEL.get(status, status)}  \n"
+                f"{counts['total']} kalimat selesai · {counts['valid']} valid · {counts['invalid']} invalid"
+            )
+            if job["error"]:
+                c_info.error(job["error"])
+            for message in job["warnings"]:
+                c_info.caption(message)
+
+            if running:
+                if c_act.button("⏸️ Jeda", key=f"pause_{job_id}", use_container_width=True):
+                    batch_jobs.pause_job(job_id)
+            elif status in batch_jobs.UNFINISHED:
+                if c_act.button("▶️ Lanjut", key=f"resume_{job_id}", use_container_width=True):
+                    batch_jobs.resume_job(job_id, KATA_DASAR_CORPUS, bersihkan_dan_stem_bali)
+
+            if c_load.button("📄 Buka", key=f"load_{job_id}", use_container_width=True,
+                             disabled=not job["checkpoint"]):
+                st.session_state.batch_result_df = batch_jobs.load_job_result(job_id)
+                st.session_state.excel_cache = None
+                st.rerun()
 
-KATA_DASAR_CORPUS = load_balinese_corpus()
+            if c_del.button("🗑️", key=f"delete_{job_id}", use_container_width=True, disabled=running):
+                batch_jobs.delete_job(job_id)
+                st.rerun(scope="fragment")
 
 @st.dialog("📝 Detail Analisis Kalimat", width="large")
 def show_batch_detail(sentence):
@@ -136,11 +154,13 @@ def show_batch_detail(sentence):
     result = run_cyk_cached(sentence)
     app_ui.render_analysis_results(
         result["words"], result["table"], result["is_valid"],
-        cnf_viz, sentence, result["backpointers_viz"]
+        cnf_viz, sentence, result["backpointers_viz"],
+        forest=result["forest"]
     )
 
 def main():
     st.set_page_config(page_title="Balinese Parser", page_icon="🏝️", layout="wide")
+    resume_batch_jobs()
 
     defaults = {
         "dark_mode": True,
@@ -183,9 +203,7 @@ def main():
         st.button("🚀 Analisis Struktur", type="primary", use_container_width=True)
 
         if text_val:
-            sentence_raw = text_val.lower().strip()
-            
-            sentence_normalized = unicodedata.normalize('NFKD', sentence_raw).encode('ASCII', 'ignore').decode('utf-8')
+            sentence_normalized = normalisasi_kalimat(text_val)
             
             sentence_final, log_perubahan = bersihkan_dan_stem_bali(sentence_normalized, KATA_DASAR_CORPUS)
             
@@ -205,7 +223,8 @@ def main():
             
             app_ui.render_analysis_results(
                 result["words"], result["table"], result["is_valid"],
-                cnf_viz, sentence_final, result["backpointers_viz"]
+                cnf_viz, sentence_final, result["backpointers_viz"],
+                forest=result["forest"]
             )
 
     elif menu == "📂 Batch Processing":
@@ -255,12 +274,25 @@ def main():
                         except Exception:
                             st.caption("_(gagal membaca preview)_")
 
-                if st.button("🚀 Proses Semua File", type="primary", use_container_width=True):
+                col_run, col_bg = st.columns(2)
+                if col_bg.button(
+                    "🕒 Jalankan di Latar Belakang", use_container_width=True,
+                    help="Cocok untuk file besar: tetap berjalan walau browser ditutup, bisa dijeda & dilanjutkan"
+                ):
+                    batch_jobs.submit_job(
+                        uploaded_files,
+                        KATA_DASAR_CORPUS,
+                        bersihkan_dan_stem_bali,
+                        workers=os.cpu_count() or 1
+                    )
+
+                if col_run.button("🚀 Proses Semua File", type="primary", use_container_width=True):
                     with st.spinner("Memproses..."):
                         df, err = batch_processor.process_files(
                             uploaded_files,
                             KATA_DASAR_CORPUS,
-                            bersihkan_dan_stem_bali
+                            bersihkan_dan_stem_bali,
+                            workers=os.cpu_count() or 1
                         )
                         if err:
                             st.error(err)
@@ -269,6 +301,8 @@ def main():
                             st.session_state.excel_cache = None
                             st.rerun()
 
+            render_batch_jobs()
+
             if st.session_state.batch_result_df is not None:
                 df_result = st.session_state.batch_result_df
                 st.divider()
@@ -299,7 +333,7 @@ def main():
                     df_view = df_result
 
                 st.markdown("#### 📥 Download Hasil")
-                col_excel, col_reset = st.columns([3, 1])
+                col_excel, col_csv, col_parquet, col_reset = st.columns([2, 1, 1, 1])
 
                 with col_excel:
                     if st.session_state.get("excel_cache") is None:
@@ -313,6 +347,25 @@ def main():
                         use_container_width=True,
                     )
 
+                # CSV / Parquet baru dibuat saat tombol diklik (lebih cepat dari Excel untuk hasil besar)
+                with col_csv:
+                    st.download_button(
+                        label="⬇️ CSV",
+                        data=lambda: batch_processor.to_csv_bytes(df_result),
+                        file_name="hasil_validasi.csv",
+                        mime="text/csv",
+                        use_container_width=True,
+                    )
+
+                with col_parquet:
+                    st.download_button(
+                        label="⬇️ Parquet",
+                        data=lambda: batch_processor.to_parquet_bytes(df_result),
+                        file_name="hasil_validasi.parquet",
+                        mime="application/vnd.apache.parquet",
+                        use_container_width=True,
+                    )
+
                 with col_reset:
                     if st.button("🗑️ Reset", use_container_width=True):
                         st.session_state.batch_result_df = None
@@ -329,6 +382,10 @@ def main():
                     column_config={
                         "sumber": st.column_config.TextColumn("Sumber File", width="medium"),
                         "status": st.column_config.TextColumn("Status",      width="small"),
+                        "oov_tokens": st.column_config.TextColumn(
+                            "Kata Tak Dikenal", width="medium",
+                            help="Kata yang tidak ada di leksikon; kalimat langsung INVALID tanpa parsing",
+                        ),
                     }
                 )
 
@@ -347,8 +404,7 @@ def main():
             sentence_original = st.session_state.batch_selected_sentence
             st.markdown(f"## 🔎 Detail Analisis: *\"{sentence_original}\"*")
 
-            sentence_raw = sentence_original.lower().strip()
-            sentence_normalized = unicodedata.normalize('NFKD', sentence_raw).encode('ASCII', 'ignore').decode('utf-8')
+            sentence_normalized = normalisasi_kalimat(sentence_original)
             sentence_final, log_perubahan = bersihkan_dan_stem_bali(sentence_normalized, KATA_DASAR_CORPUS)
 
             if log_perubahan:
@@ -363,14 +419,21 @@ def main():
             # Render visualisasi
             app_ui.render_analysis_results(
                 result["words"], result["table"], result["is_valid"],
-                cnf_viz, sentence_final, result["backpointers_viz"]
+                cnf_viz, sentence_final, result["backpointers_viz"],
+                forest=result["forest"]
             )
 
     elif menu == "📊 Statistik":
-        stats_manager.render_stats_dashboard(st.session_state.dark_mode)
+        stats_manager.render_stats_dashboard(
+            st.session_state.dark_mode,
+            cache_stats={
+                "Hasil Parsing (analisis tunggal)": parse_result_cache().stats(),
+                "Verdict Batch": batch_processor.verdict_cache_stats(),
+            },
+        )
 
     elif menu == "📚 Referensi":
-        app_ui.render_grammar_expanders(RULES_CFG, st.session_state.dark_mode)
+        app_ui.render_grammar_expanders(get_rules_cfg(), st.session_state.dark_mode)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,45 @@
+"""End-to-end process_files on a generated CSV (default 10k rows)."""
+
+import io
+
+import pandas as pd
+
+from .common import make_corpus, measure
+
+
+class _Upload(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile (bytes + .name)."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def run(quick=False):
+    # Not from app: importing the Streamlit page module is not needed to drive process_files
+    from grammar import bersihkan_dan_stem_bali, load_lexicon_index
+    from utils import batch_processor
+
+    KATA_DASAR_CORPUS = load_lexicon_index()
+
+    rows = 2_000 if quick else 10_000
+    sentences = make_corpus(rows, seed=3)
+    # Some blank cells: they must come out INVALID, never borrow another row's verdict
+    blank_rows = list(range(7, rows, 997))
+    for i in blank_rows:
+        sentences[i] = None
+    data = pd.DataFrame({"kalimat": sentences}).to_csv(index=False).encode("utf-8")
+
+    def process():
+        # Cold verdict cache every round, so dedup inside one file is measured, not cross-upload hits
+        batch_processor._verdict_cache.clear()
+        df, err = batch_processor.process_files([_Upload(data, "bench.csv")], KATA_DASAR_CORPUS, bersihkan_dan_stem_bali)
+        if err:
+            raise RuntimeError(err)
+        if (df["status"].iloc[blank_rows] != "INVALID").any():
+            raise RuntimeError("blank kalimat cell was not INVALID")
+
+    timing = measure(process, repeat=3)
+    timing["rows"] = rows
+    timing["rows_per_s"] = rows / timing["best_s"]
+    return timing
@@ -0,0 +1,58 @@
+"""cyk_algorithm on synthetic sentences of length 2-40, per engine."""
+
+import random
+
+from core import cyk_algorithm, cyk_bitset
+from core.cyk_numpy import cyk_recognize_numpy_batch
+from grammar import load_compiled_grammar
+
+from .common import make_sentence, measure
+
+LENGTHS = [2, 5, 10, 20, 30, 40]
+SENTENCES_PER_LENGTH = 20
+
+
+def run(quick=False):
+    grammar = load_compiled_grammar()
+    rng = random.Random(1)
+    lengths = LENGTHS[:4] if quick else LENGTHS
+    repeat = 3 if quick else 5
+
+    results = {}
+    for length in lengths:
+        sentences = [make_sentence(length, rng) for _ in range(SENTENCES_PER_LENGTH)]
+        per_sentence = len(sentences)
+
+        def sets():
+            for words in sentences:
+                cyk_algorithm(grammar, words)
+
+        def bitset():
+            for words in sentences:
+                cyk_algorithm(grammar, words, mode="bitset")
+
+        def recognize_bitset():
+            for words in sentences:
+                cyk_bitset(grammar, words, with_backpointers=False)
+
+        def recognize_numpy_batch():
+            cyk_recognize_numpy_batch(grammar, sentences)
+
+        results[str(length)] = {
+            name: _per_sentence(measure(func, repeat), per_sentence)
+            for name, func in [
+                ("sets", sets),
+                ("bitset", bitset),
+                ("recognize_bitset", recognize_bitset),
+                ("recognize_numpy_batch", recognize_numpy_batch),
+            ]
+        }
+    return results
+
+
+def _per_sentence(timing, count):
+    """Turn timings of a whole loop into per-sentence seconds."""
+    return {
+        key: (value / count if key.endswith("_s") else value)
+        for key, value in timing.items()
+    }
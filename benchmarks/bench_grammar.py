@@ -0,0 +1,21 @@
+"""Normalization of the full lexicon-merged grammar (epsilon, unit, CNF)."""
+
+from core import compile_grammar, convert_to_cnf, remove_epsilon_productions, remove_unit_productions
+from grammar import RULES_CFG
+
+from .common import measure
+
+
+def run(quick=False):
+    repeat = 3 if quick else 5
+    cfg_no_eps = remove_epsilon_productions(RULES_CFG)
+    cfg_strict = remove_unit_productions(cfg_no_eps)
+    cnf = convert_to_cnf(cfg_strict)
+
+    return {
+        "remove_epsilon_productions": measure(lambda: remove_epsilon_productions(RULES_CFG), repeat),
+        "remove_unit_productions": measure(lambda: remove_unit_productions(cfg_no_eps), repeat),
+        "convert_to_cnf": measure(lambda: convert_to_cnf(cfg_strict), repeat),
+        "compile_grammar": measure(lambda: compile_grammar(cnf, source=cfg_no_eps), repeat),
+        "rules": sum(len(bodies) for bodies in RULES_CFG.values()),
+    }
@@ -0,0 +1,53 @@
+"""Cold import time per entry point, measured with ``python -X importtime`` in a fresh interpreter."""
+
+import os
+import statistics
+import subprocess
+import sys
+
+# Entry points, from the bare parser core up to the full Streamlit app.
+# "import app" only defines the page: main() (page code, resuming background
+# batch jobs) runs under ``streamlit run``, not on import.
+MODULES = ["core", "grammar", "cli", "utils.batch_processor", "app"]
+HEAVY = ["streamlit", "matplotlib", "networkx", "plotly", "groq", "fpdf"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_once(module):
+    """Returns (cumulative seconds for ``module``, set of heavy packages it imported)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = None
+    heavy = set()
+    # Lines look like "import time:  self [us] | cumulative | name" (name indented by depth)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line.split("|")
+        name = name.strip()
+        if name in HEAVY:
+            heavy.add(name)
+        if name == module and cumulative_us.strip().isdigit():
+            cumulative = int(cumulative_us) / 1e6
+    return cumulative, heavy
+
+
+def run(quick=False):
+    repeat = 2 if quick else 5
+    results = {}
+    for module in MODULES:
+        rounds = []
+        heavy = set()
+        for _ in range(repeat):
+            seconds, loaded = _import_once(module)
+            rounds.append(seconds)
+            heavy |= loaded
+        results[module] = {
+            "best_s": min(rounds),
+            "median_s": statistics.median(rounds),
+            "repeat": repeat,
+            "heavy_imports": sorted(heavy),
+        }
+    return results
@@ -0,0 +1,22 @@
+"""Throughput of stem_kalimat_batch on affixed lexicon words (cold per-word memo each round)."""
+
+from .common import make_corpus, measure
+
+
+def run(quick=False):
+    from grammar import load_lexicon_index, stem_kalimat_batch
+    from grammar.stemmer import clear_stem_cache
+
+    KATA_DASAR_CORPUS = load_lexicon_index()
+
+    sentences = make_corpus(2_000 if quick else 10_000, seed=2, duplicate_rate=0.0)
+    words = sum(len(sentence.split()) for sentence in sentences)
+
+    def stem_all():
+        clear_stem_cache()
+        return stem_kalimat_batch([s.lower() for s in sentences], KATA_DASAR_CORPUS)
+
+    timing = measure(stem_all, repeat=3)
+    timing["sentences"] = len(sentences)
+    timing["words_per_s"] = words / timing["best_s"]
+    return timing
@@ -0,0 +1,85 @@
+"""
+Shared helpers for the benchmark suite: timing, and synthetic input built
+from real words of scraping/balinese_lexicon.json (no network needed).
+"""
+
+import random
+import statistics
+import time
+from functools import lru_cache
+
+from grammar import load_lexicon_index
+
+# Category patterns that the grammar accepts (S + NumP predicate, with extras),
+# repeated to reach the requested sentence length
+SENTENCE_PATTERNS = [
+    ["Noun", "Num"],
+    ["Pronoun", "Num", "Noun"],
+    ["Noun", "Det", "Num", "Noun", "Prep", "Noun"],
+    ["Noun", "Num", "Noun", "Conj", "Num", "Noun", "V", "Adj"],
+]
+
+
+def measure(func, repeat=5, number=1):
+    """
+    Run ``func`` ``number`` times per round for ``repeat`` rounds.
+
+    Returns:
+        Dictionary with best / median / mean seconds per call and the round count
+    """
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number)
+    return {
+        "best_s": min(rounds),
+        "median_s": statistics.median(rounds),
+        "mean_s": statistics.fmean(rounds),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+@lru_cache(maxsize=None)
+def _category_words():
+    """{category: words} of the categories in SENTENCE_PATTERNS, decoded from the index once."""
+    index = load_lexicon_index()
+    categories = {category for pattern in SENTENCE_PATTERNS for category in pattern}
+    return {category: index.words_in(category) for category in categories}
+
+
+def make_sentence(length, rng):
+    """Return ``length`` real lexicon words following one of SENTENCE_PATTERNS."""
+    category_words = _category_words()
+    pattern = rng.choice(SENTENCE_PATTERNS)
+    words = []
+    while len(words) < length:
+        for category in pattern:
+            words.append(rng.choice(category_words[category]))
+    return words[:length]
+
+
+def make_corpus(rows, seed=0, affix_rate=0.3, duplicate_rate=0.2):
+    """
+    Return ``rows`` raw sentences (capitalized, with punctuation), some words
+    carrying affixes for the stemmer and some sentences repeated.
+    """
+    rng = random.Random(seed)
+    prefixes = ["ma", "ka", "pa", "di", "ng"]
+    suffixes = ["ang", "ne", "in", "an"]
+
+    sentences = []
+    for _ in range(rows):
+        if sentences and rng.random() < duplicate_rate:
+            sentences.append(rng.choice(sentences))
+            continue
+        words = make_sentence(rng.randint(2, 8), rng)
+        words = [
+            (rng.choice(prefixes) + word if rng.random() < 0.5 else word + rng.choice(suffixes))
+            if rng.random() < affix_rate else word
+            for word in words
+        ]
+        sentences.append(" ".join(words).capitalize() + ".")
+    return sentences
@@ -0,0 +1,123 @@
+"""
+Benchmark runner.
+
+    python -m benchmarks.run                      # all suites → benchmarks/results/<timestamp>.json
+    python -m benchmarks.run --only cyk grammar   # subset
+    python -m benchmarks.run --quick -o out.json  # smaller inputs
+    python -m benchmarks.run --compare old.json   # exit 1 if a hot path got slower
+
+Runs offline; every input is generated from scraping/balinese_lexicon.json.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+SUITES = ["import", "grammar", "cyk", "stemmer", "batch"]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suites(names, quick=False):
+    """Run the named suites and return the full result document."""
+    import importlib
+
+    results = {}
+    for name in names:
+        module = importlib.import_module(f"benchmarks.bench_{name}")
+        sys.stderr.write(f"[bench] {name}...\n")
+        start = time.perf_counter()
+        results[name] = module.run(quick=quick)
+        sys.stderr.write(f"[bench] {name} done in {time.perf_counter() - start:.1f}s\n")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def _timings(node, path=()):
+    """Yield (path, best_s) for every timing entry in a nested result dict."""
+    if isinstance(node, dict):
+        if "best_s" in node:
+            yield "/".join(path), node["best_s"]
+            return
+        for key, value in node.items():
+            yield from _timings(value, path + (key,))
+
+
+def compare(baseline, current, threshold):
+    """
+    Compare best-of timings of two result documents.
+
+    Returns:
+        List of (path, old_s, new_s, ratio) for entries slower than 1 + threshold
+    """
+    old = dict(_timings(baseline.get("results", {})))
+    regressions = []
+    for path, new_s in _timings(current.get("results", {})):
+        old_s = old.get(path)
+        if old_s and new_s / old_s > 1 + threshold:
+            regressions.append((path, old_s, new_s, new_s / old_s))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the parser benchmark suite.")
+    parser.add_argument("--only", nargs="+", choices=SUITES, help="suites to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs for a fast smoke run")
+    parser.add_argument("-o", "--output", help="result JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown ratio before flagging a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    # Streamlit warns about missing ScriptRunContext when app/batch code runs headless
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    document = run_suites(args.only or SUITES, quick=args.quick)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    sys.stderr.write(f"[bench] results written to {output}\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, document, args.threshold)
+        for path, old_s, new_s, ratio in regressions:
+            sys.stderr.write(f"[bench] REGRESSION {path}: {old_s * 1000:.3f} ms → {new_s * 1000:.3f} ms (x{ratio:.2f})\n")
+        if regressions:
+            return 1
+        sys.stderr.write("[bench] no regressions\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Validasi batch dari command line, tanpa Streamlit.
+
+    python cli.py validate korpus.csv -o hasil.xlsx --workers 8
+    python -m cli validate a.csv b.txt -o hasil.csv
+    python cli.py validate korpus.csv -o hasil.parquet
+
+Input dibaca per chunk (lihat batch_processor.stream_process_files), progress
+dan ringkasan ditulis ke stderr. Exit code: 0 = selesai, 1 = gagal diproses,
+2 = argumen / file tidak valid.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+OUTPUT_FORMATS = ('.csv', '.xlsx', '.parquet')
+
+
+def _plain(message):
+    # Pesan batch_processor ditulis untuk Streamlit (markdown) → teks biasa
+    return re.sub(r'\*\*|`', '', message)
+
+
+def _warn(message):
+    sys.stderr.write(_plain(message) + "\n")
+
+
+def _progress_printer():
+    interactive = sys.stderr.isatty()
+
+    def on_progress(done, name):
+        if interactive:
+            sys.stderr.write(f"\r⏳ {name}: {done} baris diproses")
+        else:
+            sys.stderr.write(f"⏳ {name}: {done} baris diproses\n")
+        sys.stderr.flush()
+
+    return on_progress
+
+
+def validate(args):
+    missing = [path for path in args.inputs if not os.path.isfile(path)]
+    if missing:
+        _warn(f"❌ File tidak ditemukan: {', '.join(missing)}")
+        return 2
+
+    ext = os.path.splitext(args.output)[1].lower()
+    if ext not in OUTPUT_FORMATS:
+        _warn(f"❌ Format output `{ext or args.output}` belum didukung. Pilih: {', '.join(OUTPUT_FORMATS)}")
+        return 2
+
+    from grammar import bersihkan_dan_stem_bali, load_lexicon_index
+    from utils import batch_processor
+
+    kamus = load_lexicon_index()
+    if not kamus.data:
+        return 1
+
+    # Excel / Parquet ditulis dari CSV sementara setelah semua chunk selesai
+    target = args.output
+    if ext != '.csv':
+        fd, target = tempfile.mkstemp(suffix='.csv', dir=os.path.dirname(os.path.abspath(args.output)))
+        os.close(fd)
+
+    start = time.perf_counter()
+    try:
+        counts, err = batch_processor.stream_process_files(
+            args.inputs,
+            target,
+            kamus,
+            bersihkan_dan_stem_bali,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            on_progress=None if args.quiet else _progress_printer(),
+            warn=_warn,
+        )
+        if not args.quiet and sys.stderr.isatty():
+            sys.stderr.write("\n")
+        if err:
+            _warn(f"❌ {err}")
+            return 1
+
+        if ext == '.xlsx':
+            import pandas as pd
+            # Dibaca per chunk lagi: workbook write-only tidak menampung seluruh hasil di memori
+            batch_processor.write_excel(
+                pd.read_csv(target, keep_default_na=False, chunksize=args.chunksize), args.output
+            )
+        elif ext == '.parquet':
+            import pandas as pd
+            batch_processor.write_parquet(
+                pd.read_csv(target, dtype=str, keep_default_na=False, chunksize=args.chunksize), args.output
+            )
+    finally:
+        if target != args.output and os.path.exists(target):
+            os.remove(target)
+
+    elapsed = time.perf_counter() - start
+    _warn(
+        f"✅ {counts['total']} kalimat — VALID: {counts['valid']}, "
+        f"INVALID: {counts['invalid']} ({elapsed:.1f} detik) → {args.output}"
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Balinese Sentence Parser — validasi batch tanpa UI",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("validate", help="Validasi kalimat dari CSV/XLSX/XLS/DOCX/TXT")
+    cmd.add_argument("inputs", nargs="+", help="File input (kolom wajib: kalimat)")
+    cmd.add_argument("-o", "--output", required=True, help="File hasil (.csv, .xlsx atau .parquet)")
+    cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                     help="Jumlah proses worker untuk parsing (default: jumlah CPU)")
+    cmd.add_argument("--chunksize", type=int, default=5000,
+                     help="Baris per chunk saat membaca input (default: 5000)")
+    cmd.add_argument("-q", "--quiet", action="store_true", help="Tanpa progress per chunk")
+    cmd.set_defaults(func=validate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
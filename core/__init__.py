@@ -1,3 +1,14 @@
+from .compiled_grammar import CompiledGrammar, compile_grammar
 from .cnf_converter import convert_to_cnf, remove_epsilon_productions, remove_unit_productions
-from .cyk_parser import cyk_algorithm
-from .parse_tree_generator import create_parse_tree
\ No newline at end of file
+from .cyk_parser import cyk_algorithm, source_backpointers
+from .cyk_bitset import BitsetChart, cyk_bitset, cyk_recognize_bitset, extend_bitset_chart
+from .lru_cache import LRUCache
+from .parse_forest import ParseForest, build_parse_forest, iter_parse_trees
+
+
+def __getattr__(name):
+    # create_parse_tree pulls in networkx + matplotlib, which only the UI needs
+    if name == "create_parse_tree":
+        from .parse_tree_generator import create_parse_tree
+        return create_parse_tree
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
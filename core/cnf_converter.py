@@ -7,6 +7,8 @@ which is required for the CYK parsing algorithm.
 
 from itertools import combinations
 
+from .compiled_grammar import CompiledGrammar
+
 
 def get_terminals(grammar):
     """
@@ -27,6 +29,50 @@ def get_terminals(grammar):
     return terminals
 
 
+def find_nullable(cfg):
+    """
+    Find every symbol that can derive the empty string.
+
+    Worklist algorithm: each rule keeps a count of body symbols not yet
+    known to be nullable; when a symbol becomes nullable, only the rules
+    that contain it are updated. Runs in time linear in the grammar size.
+
+    Args:
+        cfg: Context-Free Grammar dictionary
+
+    Returns:
+        Set of nullable non-terminals
+    """
+    nullable = set()
+    worklist = []
+    rule_heads = []
+    remaining = []
+    occurrences = {}
+
+    for head, bodies in cfg.items():
+        for body in bodies:
+            rule_id = len(rule_heads)
+            rule_heads.append(head)
+            remaining.append(len(body))
+            if not body and head not in nullable:
+                nullable.add(head)
+                worklist.append(head)
+            for symbol in body:
+                if symbol in cfg:
+                    occurrences.setdefault(symbol, []).append(rule_id)
+
+    while worklist:
+        symbol = worklist.pop()
+        for rule_id in occurrences.get(symbol, ()):
+            remaining[rule_id] -= 1
+            head = rule_heads[rule_id]
+            if remaining[rule_id] == 0 and head not in nullable:
+                nullable.add(head)
+                worklist.append(head)
+
+    return nullable
+
+
 def remove_epsilon_productions(cfg):
     """
     Remove epsilon (empty) productions from the grammar.
@@ -37,39 +83,70 @@ def remove_epsilon_productions(cfg):
     Returns:
         Modified grammar without epsilon productions
     """
-    nullable = set()
-    
-    # Find nullable symbols (symbols that can derive empty string)
-    changed = True
-    while changed:
-        changed = False
-        for head, bodies in cfg.items():
-            if head not in nullable:
-                for body in bodies:
-                    if len(body) == 0 or all(symbol in nullable for symbol in body):
-                        nullable.add(head)
-                        changed = True
-                        break
+    nullable = find_nullable(cfg)
     
     # Generate new rules without epsilon productions
     new_cfg = {}
     for head, bodies in cfg.items():
-        new_bodies = set()
+        # Ordered, hashed set of bodies (dict keys) for O(1) de-duplication
+        new_bodies = {}
         for body in bodies:
-            if body:  # Skip empty productions
-                # Find positions of nullable symbols
-                indices = [i for i, symbol in enumerate(body) if symbol in nullable]
-                # Generate all combinations of removing nullable symbols
-                for r in range(len(indices) + 1):
-                    for subset in combinations(indices, r):
-                        new_body = tuple(sym for i, sym in enumerate(body) if i not in subset)
-                        if new_body:  # Only add non-empty productions
-                            new_bodies.add(new_body)
+            if not body:  # Skip empty productions
+                continue
+            # Find positions of nullable symbols
+            indices = [i for i, symbol in enumerate(body) if symbol in nullable]
+            if not indices:
+                # Most rules (every lexicon entry) have nothing to drop
+                new_bodies[tuple(body)] = None
+                continue
+            # Generate all combinations of removing nullable symbols
+            for r in range(len(indices) + 1):
+                for subset in combinations(indices, r):
+                    new_body = tuple(sym for i, sym in enumerate(body) if i not in subset)
+                    if new_body:  # Only add non-empty productions
+                        new_bodies[new_body] = None
         new_cfg[head] = [list(body) for body in new_bodies]
     
     return new_cfg
 
 
+def unit_closure(cfg):
+    """
+    Compute, for every non-terminal A, the non-terminals B with A =>* B
+    using only unit productions (A -> B).
+
+    One breadth-first search per non-terminal over the unit graph, so
+    the cost is O(V * E) on the (small) graph of unit rules instead of
+    repeated rescans of every unit pair.
+
+    Args:
+        cfg: Context-Free Grammar dictionary
+
+    Returns:
+        Dictionary head -> list of reachable non-terminals (BFS order, excluding head
+        unless it lies on a unit cycle)
+    """
+    unit_graph = {head: [] for head in cfg}
+    for head, bodies in cfg.items():
+        for body in bodies:
+            if len(body) == 1 and body[0] in cfg and body[0] not in unit_graph[head]:
+                unit_graph[head].append(body[0])
+
+    closure = {}
+    for head in cfg:
+        seen = set()
+        order = []
+        queue = list(unit_graph[head])
+        for symbol in queue:
+            if symbol in seen:
+                continue
+            seen.add(symbol)
+            order.append(symbol)
+            queue.extend(unit_graph[symbol])
+        closure[head] = order
+    return closure
+
+
 def remove_unit_productions(cfg):
     """
     Remove unit productions (A -> B) from the grammar.
@@ -80,43 +157,26 @@ def remove_unit_productions(cfg):
     Returns:
         Modified grammar without unit productions
     """
-    # Get all unit pairs (A -> B where B is non-terminal)
-    unit_pairs = set()
-    for head, bodies in cfg.items():
-        for body in bodies:
-            if len(body) == 1 and body[0] in cfg:
-                unit_pairs.add((head, body[0]))
-    
-    # Add transitive unit pairs (if A -> B and B -> C, then A -> C)
-    changed = True
-    while changed:
-        changed = False
-        for a, b in list(unit_pairs):
-            for c in [p[1] for p in unit_pairs if p[0] == b]:
-                if (a, c) not in unit_pairs:
-                    unit_pairs.add((a, c))
-                    changed = True
-    
-    # Create new grammar without unit productions
-    new_cfg = {head: [] for head in cfg}
-    for head, bodies in cfg.items():
-        # Add non-unit productions
-        for body in bodies:
-            if len(body) != 1 or (len(body) == 1 and body[0] not in cfg):
-                new_cfg[head].append(body)
-        
-        # Add productions from unit pairs
-        for pair in unit_pairs:
-            if pair[0] == head:
-                for body in cfg[pair[1]]:
-                    if len(body) != 1 or (len(body) == 1 and body[0] not in cfg):
-                        if body not in new_cfg[head]:
-                            new_cfg[head].append(body)
+    # Non-unit bodies of every head, as tuples so they can be hashed
+    non_unit = {
+        head: [tuple(body) for body in bodies if len(body) != 1 or body[0] not in cfg]
+        for head, bodies in cfg.items()
+    }
+    
+    # Create new grammar: own non-unit productions first, then those of
+    # every symbol reachable through unit productions (A =>* B)
+    new_cfg = {}
+    for head, reachable in unit_closure(cfg).items():
+        new_bodies = dict.fromkeys(non_unit[head])
+        for symbol in reachable:
+            for body in non_unit[symbol]:
+                new_bodies.setdefault(body)
+        new_cfg[head] = [list(body) for body in new_bodies]
     
     return new_cfg
 
 
-def convert_to_cnf(cfg):
+def convert_to_cnf(cfg, compiled=False):
     """
     Convert grammar to Chomsky Normal Form (CNF).
     
@@ -126,6 +186,7 @@ def convert_to_cnf(cfg):
     
     Args:
         cfg: Context-Free Grammar dictionary
+        compiled: If True, return an indexed CompiledGrammar instead of a dict
         
     Returns:
         Grammar in Chomsky Normal Form
@@ -179,4 +240,6 @@ def convert_to_cnf(cfg):
                 
                 final_cfg[current_head].append(remaining_body)
     
+    if compiled:
+        return CompiledGrammar(final_cfg)
     return final_cfg
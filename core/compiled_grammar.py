@@ -0,0 +1,178 @@
+"""
+Compiled (Indexed) Grammar
+
+Wraps a CNF grammar dictionary with reverse-lookup indexes so the
+CYK parser can find matching rules by their body instead of scanning
+every production of the grammar for every cell.
+"""
+
+from collections.abc import Mapping
+
+# Bump when the pickled layout of CompiledGrammar changes (invalidates disk caches)
+COMPILED_FORMAT_VERSION = 4
+
+
+class CompiledGrammar(Mapping):
+    """
+    Read-only grammar with three reverse indexes.
+
+    Behaves like the original grammar dictionary (``items()``, ``[head]``,
+    ``in``), so it can be passed anywhere a plain grammar was expected.
+
+    Indexes:
+        terminal_heads: word -> tuple of heads with rule ``head -> word``
+        binary_heads: (B, C) -> list of (rule_id, head) with rule ``head -> B C``
+        unary_parents: child -> list of (rule_id, head) with rule ``head -> child``
+
+    ``rule_id`` is the position of the rule when walking ``grammar.items()``
+    in order. The parser uses it to break ties exactly like a linear scan
+    over the grammar would.
+
+    Every nonterminal also gets a small integer id (``symbol_ids``), which
+    the bitset parser uses to store a chart cell as a single int mask.
+
+    ``source`` is an optional grammar the CNF was derived from (usually the
+    epsilon-free grammar that still has unit rules), kept compiled so a
+    parse with this grammar can be explained in the original symbols.
+    """
+
+    def __init__(self, rules, source=None):
+        self.rules = rules
+        self.source = compile_grammar(source) if source is not None else None
+        self.terminal_heads = {}
+        self.binary_heads = {}
+        self.unary_parents = {}
+
+        rule_id = 0
+        for head, bodies in rules.items():
+            for body in bodies:
+                if len(body) == 1:
+                    symbol = body[0]
+                    if symbol in rules:
+                        self.unary_parents.setdefault(symbol, []).append((rule_id, head))
+                    else:
+                        heads = self.terminal_heads.setdefault(symbol, [])
+                        if head not in heads:
+                            heads.append(head)
+                elif len(body) == 2:
+                    self.binary_heads.setdefault((body[0], body[1]), []).append((rule_id, head))
+                rule_id += 1
+
+        # Words of the same categories share one head tuple (thousands of
+        # lexicon words map onto a handful of distinct category sets)
+        shared = {}
+        self.terminal_heads = {
+            word: shared.setdefault(tuple(heads), tuple(heads))
+            for word, heads in self.terminal_heads.items()
+        }
+
+        self.symbols = list(rules)
+        self.symbol_ids = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        self._bitset_tables = None
+
+    def bitset_tables(self):
+        """
+        Rule tables keyed by symbol id, built on first use.
+
+        Returns:
+            Dictionary with:
+                - terminal_masks: word -> mask of heads with rule ``head -> word``
+                - binary_by_left: B id -> list of (C id, head id, rule_id)
+                - right_masks: B id -> mask of every C that follows B in a rule
+                - left_mask: mask of every B that starts some binary rule
+                - unary_by_child: child id -> list of (rule_id, head id)
+                - unary_closure: symbol id -> mask of the symbol and all unary ancestors
+        """
+        if self._bitset_tables is not None:
+            return self._bitset_tables
+
+        ids = self.symbol_ids
+
+        terminal_masks = {}
+        for word, heads in self.terminal_heads.items():
+            mask = 0
+            for head in heads:
+                mask |= 1 << ids[head]
+            terminal_masks[word] = mask
+
+        binary_by_left = {}
+        right_masks = {}
+        for (B, C), entries in self.binary_heads.items():
+            if B not in ids or C not in ids:
+                continue
+            b, c = ids[B], ids[C]
+            for rule_id, head in entries:
+                binary_by_left.setdefault(b, []).append((c, ids[head], rule_id))
+            right_masks[b] = right_masks.get(b, 0) | (1 << c)
+
+        left_mask = 0
+        for b in right_masks:
+            left_mask |= 1 << b
+
+        unary_by_child = {
+            ids[child]: [(rule_id, ids[head]) for rule_id, head in parents]
+            for child, parents in self.unary_parents.items()
+        }
+
+        unary_closure = {}
+        for idx in range(len(self.symbols)):
+            mask = 1 << idx
+            stack = [idx]
+            while stack:
+                for _, parent in unary_by_child.get(stack.pop(), ()):
+                    if not mask >> parent & 1:
+                        mask |= 1 << parent
+                        stack.append(parent)
+            unary_closure[idx] = mask
+
+        self._bitset_tables = {
+            "terminal_masks": terminal_masks,
+            "binary_by_left": binary_by_left,
+            "right_masks": right_masks,
+            "left_mask": left_mask,
+            "unary_by_child": unary_by_child,
+            "unary_closure": unary_closure,
+        }
+        return self._bitset_tables
+
+    def unknown_words(self, words):
+        """Words without any lexical rule ``head -> word``, in order and without duplicates."""
+        terminal_heads = self.terminal_heads
+        unknown = [word for word in words if word not in terminal_heads]
+        return list(dict.fromkeys(unknown)) if unknown else unknown
+
+    def decode_mask(self, mask):
+        """Return the set of symbol names whose bits are set in ``mask``."""
+        symbols = set()
+        while mask:
+            low = mask & -mask
+            symbols.add(self.symbols[low.bit_length() - 1])
+            mask ^= low
+        return symbols
+
+    def __getitem__(self, head):
+        return self.rules[head]
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+
+def compile_grammar(grammar, source=None):
+    """
+    Build a CompiledGrammar from a grammar dictionary.
+
+    Args:
+        grammar: Grammar in CNF format (dictionary) or an already compiled grammar
+        source: Optional grammar the CNF was derived from (see CompiledGrammar)
+
+    Returns:
+        CompiledGrammar instance
+    """
+    if isinstance(grammar, CompiledGrammar):
+        if source is None:
+            return grammar
+        grammar = grammar.rules
+    return CompiledGrammar(grammar, source=source)
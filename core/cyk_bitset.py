@@ -0,0 +1,288 @@
+"""
+Bitset CYK Parser
+
+CYK variant that stores every chart cell as one Python int, where bit
+``i`` is set when nonterminal ``grammar.symbols[i]`` derives the span.
+Binary combination becomes bitwise operations over precomputed rule
+masks instead of hashing symbol strings.
+
+The recognizer-only functions fill the chart column by column (all spans
+ending at word j before word j + 1), so a chart of a sentence can be
+extended when words are appended (``extend_bitset_chart``) and recognition
+can stop as soon as the prefix read so far has no possible completion
+(``cyk_recognize_bitset``).
+"""
+
+from .compiled_grammar import compile_grammar
+
+
+def _iter_bits(mask):
+    """Yield the index of every set bit in ``mask``, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitsetChart:
+    """
+    CYK chart with one int mask per cell.
+
+    ``chart[i][j]`` returns the cell as a set of symbol names (decoded on
+    first access and cached), so the chart can be handed to code written
+    for the ``cyk_table`` of sets, e.g. ``ui.app_ui.render_parse_table``.
+    """
+
+    def __init__(self, grammar, masks):
+        self.grammar = grammar
+        self.masks = masks
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self.masks)
+
+    def __getitem__(self, i):
+        return _BitsetRow(self, i)
+
+    def cell(self, i, j):
+        """Return the symbols of cell (i, j) as a set."""
+        key = (i, j)
+        if key not in self._decoded:
+            self._decoded[key] = self.grammar.decode_mask(self.masks[i][j])
+        return self._decoded[key]
+
+    def to_table(self):
+        """Return the chart as the classic ``cyk_table`` (list of lists of sets)."""
+        n = len(self.masks)
+        return [[self.cell(i, j) for j in range(n)] for i in range(n)]
+
+
+class _BitsetRow:
+    """Row view of a BitsetChart so ``chart[i][j]`` works like a nested list."""
+
+    def __init__(self, chart, i):
+        self.chart = chart
+        self.i = i
+
+    def __len__(self):
+        return len(self.chart.masks[self.i])
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += len(self)
+        return self.chart.cell(self.i, j)
+
+
+def _unary_closure_masks(tables, cell, cell_backpointers, symbols):
+    """
+    Close a cell mask under unary rules, recording backpointers.
+
+    Same round-based semantics as the set-based parser: parents found in
+    one round can only trigger more parents in the next round, and the
+    first rule in grammar order wins.
+    """
+    unary_by_child = tables["unary_by_child"]
+    frontier = cell
+    while frontier:
+        found = {}
+        for child in _iter_bits(frontier):
+            for rule_id, head in unary_by_child.get(child, ()):
+                if not cell >> head & 1 and (head not in found or rule_id < found[head][0]):
+                    found[head] = (rule_id, child)
+
+        frontier = 0
+        for head, (_, child) in found.items():
+            frontier |= 1 << head
+            cell_backpointers[symbols[head]] = ([symbols[child]], None)
+        cell |= frontier
+    return cell
+
+
+def cyk_bitset(grammar, words, with_backpointers=True):
+    """
+    Parse a sentence with an integer bitmask per chart cell.
+
+    Args:
+        grammar: Grammar in CNF format (dictionary or CompiledGrammar)
+        words: List of words to parse
+        with_backpointers: If False, only recognize (backpointers is None)
+
+    Returns:
+        Tuple (is_valid, chart, backpointers):
+            - is_valid: Boolean indicating if sentence is grammatically valid
+            - chart: BitsetChart; ``chart.to_table()`` gives the table of sets
+            - backpointers: Same format as ``cyk_algorithm``, or None
+    """
+    grammar = compile_grammar(grammar)
+    tables = grammar.bitset_tables()
+    terminal_masks = tables["terminal_masks"]
+    binary_by_left = tables["binary_by_left"]
+    right_masks = tables["right_masks"]
+    unary_closure = tables["unary_closure"]
+    symbols = grammar.symbols
+
+    n = len(words)
+    masks = [[0] * n for _ in range(n)]
+    backpointers = [[{} for _ in range(n)] for _ in range(n)] if with_backpointers else None
+
+    # Step 1: Diagonal
+    for i in range(n):
+        word = words[i]
+        cell = terminal_masks.get(word, 0)
+        if with_backpointers:
+            for head in _iter_bits(cell):
+                backpointers[i][i][symbols[head]] = (['terminal', word], None)
+            cell = _unary_closure_masks(tables, cell, backpointers[i][i], symbols)
+        else:
+            for head in _iter_bits(cell):
+                cell |= unary_closure[head]
+        masks[i][i] = cell
+
+    # Step 2: Binary rules
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cell = 0
+
+            for k in range(i, j):
+                left = masks[i][k]
+                right = masks[k + 1][j]
+                if not left or not right:
+                    continue
+
+                found = {}
+                for b in _iter_bits(left):
+                    if not right & right_masks.get(b, 0):
+                        continue
+                    for c, head, rule_id in binary_by_left[b]:
+                        if not right >> c & 1:
+                            continue
+                        if not with_backpointers:
+                            cell |= 1 << head
+                        elif not cell >> head & 1 and (head not in found or rule_id < found[head][0]):
+                            found[head] = (rule_id, b, c)
+
+                for head, (_, b, c) in found.items():
+                    cell |= 1 << head
+                    backpointers[i][j][symbols[head]] = ([symbols[b], symbols[c]], k)
+
+            if with_backpointers:
+                cell = _unary_closure_masks(tables, cell, backpointers[i][j], symbols)
+            else:
+                for head in _iter_bits(cell):
+                    cell |= unary_closure[head]
+            masks[i][j] = cell
+
+    root = grammar.symbol_ids.get('K')
+    is_valid = n > 0 and root is not None and bool(masks[0][n-1] >> root & 1)
+    return is_valid, BitsetChart(grammar, masks), backpointers
+
+
+def _fill_column(tables, masks, words, j):
+    """
+    Fill column j of a recognizer chart in place: cell (j, j), then (j-1, j) up to (0, j).
+
+    Only cells of earlier columns and of this column are read, so the
+    cells of words[:j] never change when words are appended.
+
+    Returns:
+        OR of every mask in the column
+    """
+    binary_by_left = tables["binary_by_left"]
+    right_masks = tables["right_masks"]
+    unary_closure = tables["unary_closure"]
+
+    cell = tables["terminal_masks"].get(words[j], 0)
+    for head in _iter_bits(cell):
+        cell |= unary_closure[head]
+    masks[j][j] = column = cell
+
+    for i in range(j - 1, -1, -1):
+        cell = 0
+        for k in range(i, j):
+            left = masks[i][k]
+            right = masks[k + 1][j]
+            if not left or not right:
+                continue
+            for b in _iter_bits(left):
+                if not right & right_masks.get(b, 0):
+                    continue
+                for c, head, _ in binary_by_left[b]:
+                    if right >> c & 1:
+                        cell |= 1 << head
+        for head in _iter_bits(cell):
+            cell |= unary_closure[head]
+        masks[i][j] = cell
+        column |= cell
+    return column
+
+
+def extend_bitset_chart(grammar, chart, words):
+    """
+    Recognizer chart of ``words``, reusing the chart of a prefix of it.
+
+    Only the columns of the appended words are filled: O(n^2) work per
+    appended word instead of O(n^3) for the whole sentence. The prefix
+    chart is copied, never modified, so it can stay in a cache.
+
+    Args:
+        grammar: Grammar in CNF format (dictionary or CompiledGrammar)
+        chart: BitsetChart (or its ``masks``) of ``words[:m]``, or None
+        words: Full list of words; its first m words must be the prefix
+
+    Returns:
+        Tuple (is_valid, chart) like ``cyk_bitset(..., with_backpointers=False)``
+    """
+    grammar = compile_grammar(grammar)
+    tables = grammar.bitset_tables()
+    prefix = chart.masks if isinstance(chart, BitsetChart) else (chart or [])
+
+    m = len(prefix)
+    n = len(words)
+    if m > n:
+        raise ValueError(f"prefix chart covers {m} words, sentence has {n}")
+    masks = [row[:m] + [0] * (n - m) for row in prefix] + [[0] * n for _ in range(n - m)]
+
+    for j in range(m, n):
+        _fill_column(tables, masks, words, j)
+
+    root = grammar.symbol_ids.get('K')
+    is_valid = n > 0 and root is not None and bool(masks[0][n-1] >> root & 1)
+    return is_valid, BitsetChart(grammar, masks)
+
+
+def cyk_recognize_bitset(grammar, words):
+    """
+    Decide whether a sentence is derivable from 'K', stopping early.
+
+    The chart is filled left to right and recognition stops at word j when
+    the sentence can no longer be completed:
+
+    - word j has no category (its diagonal cell is empty), or
+    - j is not the last word and no span ending at j holds a symbol that
+      starts a binary rule; the topmost constituent ending at j must be a
+      left child, because the tree still has to cover word j + 1
+
+    Args:
+        grammar: Grammar in CNF format (dictionary or CompiledGrammar)
+        words: List of words to parse
+
+    Returns:
+        Boolean indicating if sentence is grammatically valid
+    """
+    grammar = compile_grammar(grammar)
+    root = grammar.symbol_ids.get('K')
+    n = len(words)
+    if not n or root is None:
+        return False
+
+    tables = grammar.bitset_tables()
+    left_mask = tables["left_mask"]
+    masks = [[0] * n for _ in range(n)]
+    for j in range(n):
+        column = _fill_column(tables, masks, words, j)
+        if not masks[j][j]:
+            return False
+        if j < n - 1 and not column & left_mask:
+            return False
+    return bool(masks[0][n-1] >> root & 1)
@@ -0,0 +1,192 @@
+"""
+Vectorized CYK Recognizer (NumPy)
+
+Recognition-only CYK engine for batch validation. The chart is an
+n x n x |N| boolean tensor and every span length is computed with a few
+NumPy operations over the binary-rule tensor. No backpointers are built.
+
+Memory grows with n^2 per sentence, so sentences of equal length are
+stacked only up to NUMPY_BATCH_BYTES; a sentence too long to fit the
+budget on its own is recognized by the bitset engine instead.
+"""
+
+import numpy as np
+
+from .compiled_grammar import compile_grammar
+from .cyk_bitset import cyk_recognize_bitset
+
+# Upper bound on the float32 tensors of one stacked group (chart + rule products)
+NUMPY_BATCH_BYTES = 64 * 1024 * 1024
+
+
+def numpy_tables(grammar):
+    """
+    Build (once per grammar) the tensors used by the vectorized recognizer.
+
+    Args:
+        grammar: CompiledGrammar
+
+    Returns:
+        Dictionary with:
+            - binary: float32 array (|rules|, |N|); row r is one-hot on the
+              head A of binary rule r = ``A -> B C``
+            - rule_left / rule_right: symbol id of B / C for every binary rule
+            - closure: float32 array (|N|, |N|); [B, A] is 1 when A =>* B by unary rules
+            - word_rows / lexical: word -> row of ``lexical``, a float32 array
+              (|words|, |N|) of each word's heads closed under unary rules
+    """
+    cached = getattr(grammar, "_numpy_tables", None)
+    if cached is not None:
+        return cached
+
+    tables = grammar.bitset_tables()
+    size = len(grammar.symbols)
+
+    # One column per binary rule: its B, its C, and a one-hot row for its head
+    rule_left, rule_right, rule_heads = [], [], []
+    for b, entries in tables["binary_by_left"].items():
+        for c, head, _ in entries:
+            rule_left.append(b)
+            rule_right.append(c)
+            rule_heads.append(head)
+
+    binary = np.zeros((len(rule_heads), size), dtype=np.float32)
+    binary[np.arange(len(rule_heads)), rule_heads] = 1.0
+
+    closure = np.zeros((size, size), dtype=np.float32)
+    for idx, mask in tables["unary_closure"].items():
+        for parent in range(size):
+            if mask >> parent & 1:
+                closure[idx, parent] = 1.0
+
+    # One row per word: its lexical heads, already closed under unary rules
+    word_rows = {}
+    lexical = np.zeros((len(tables["terminal_masks"]), size), dtype=np.float32)
+    for row, (word, mask) in enumerate(tables["terminal_masks"].items()):
+        word_rows[word] = row
+        while mask:
+            low = mask & -mask
+            lexical[row, low.bit_length() - 1] = 1.0
+            mask ^= low
+    lexical = ((lexical @ closure) > 0).astype(np.float32)
+
+    cached = {
+        "binary": binary,
+        "rule_left": np.array(rule_left, dtype=np.intp),
+        "rule_right": np.array(rule_right, dtype=np.intp),
+        "closure": closure,
+        "word_rows": word_rows,
+        "lexical": lexical,
+    }
+    grammar._numpy_tables = cached
+    return cached
+
+
+def cyk_recognize_numpy(grammar, words):
+    """
+    Decide whether a sentence is derivable from 'K', without backpointers.
+
+    Args:
+        grammar: Grammar in CNF format (dictionary or CompiledGrammar)
+        words: List of words to parse
+
+    Returns:
+        Boolean indicating if sentence is grammatically valid
+    """
+    return cyk_recognize_numpy_batch(grammar, [words])[0]
+
+
+def cyk_recognize_numpy_batch(grammar, sentences):
+    """
+    Recognize many sentences at once.
+
+    Sentences of equal length are stacked into one (batch, n, n, |N|)
+    tensor, so each span length costs a handful of NumPy calls for the
+    whole group instead of per sentence. The batch size shrinks as n
+    grows to stay within NUMPY_BATCH_BYTES (see ``_group_bytes``).
+
+    Args:
+        grammar: Grammar in CNF format (dictionary or CompiledGrammar)
+        sentences: List of word lists
+
+    Returns:
+        List of booleans, in the same order as ``sentences``
+    """
+    grammar = compile_grammar(grammar)
+    results = [False] * len(sentences)
+    root = grammar.symbol_ids.get('K')
+    if root is None:
+        return results
+
+    tables = numpy_tables(grammar)
+    word_rows = tables["word_rows"]
+
+    groups = {}
+    for idx, words in enumerate(sentences):
+        # A word without categories can never be covered
+        if words and all(word in word_rows for word in words):
+            groups.setdefault(len(words), []).append(idx)
+
+    for n, indices in groups.items():
+        per_sentence = _group_bytes(tables, n)
+        if per_sentence > NUMPY_BATCH_BYTES:
+            for idx in indices:
+                results[idx] = cyk_recognize_bitset(grammar, sentences[idx])
+            continue
+
+        step = NUMPY_BATCH_BYTES // per_sentence
+        for start in range(0, len(indices), step):
+            part = indices[start:start + step]
+            valid = _recognize_group(tables, [sentences[idx] for idx in part], n, root)
+            for idx, is_valid in zip(part, valid):
+                results[idx] = bool(is_valid)
+    return results
+
+
+def _group_bytes(tables, n):
+    """
+    Peak bytes per sentence of ``_recognize_group`` for length ``n``: the
+    chart plus, for the widest span length (about (n/2)^2 start/split
+    pairs), the gathered left/right cells and the two rule operands with
+    their product.
+    """
+    size = tables["closure"].shape[0]
+    rules = len(tables["rule_left"])
+    pairs = max((n - length + 1) * (length - 1) for length in range(1, n + 1))
+    itemsize = np.dtype(np.float32).itemsize
+    return itemsize * (n * n * size + pairs * (2 * size + 3 * rules))
+
+
+def _recognize_group(tables, group, n, root):
+    """Run the vectorized CYK over sentences that all have ``n`` words."""
+    binary = tables["binary"]
+    rule_left = tables["rule_left"]
+    rule_right = tables["rule_right"]
+    closure = tables["closure"]
+    word_rows = tables["word_rows"]
+    size = closure.shape[0]
+    batch = len(group)
+
+    chart = np.zeros((batch, n, n, size), dtype=np.float32)
+
+    # Step 1: Diagonal (lexical categories + unary closure)
+    rows = np.array([[word_rows[word] for word in words] for words in group], dtype=np.intp)
+    diag = np.arange(n)
+    chart[:, diag, diag] = tables["lexical"][rows]
+
+    # Step 2: One vectorized step per span length
+    for length in range(2, n + 1):
+        starts = np.arange(n - length + 1)[:, None]
+        splits = np.arange(length - 1)[None, :]
+        left = chart[:, starts, starts + splits]                      # (batch, m, length-1, |N|)
+        right = chart[:, starts + splits + 1, starts + length - 1]    # (batch, m, length-1, |N|)
+
+        m = left.shape[1]
+        # Which binary rules fire at some split, then map rules to their heads
+        fired = (left[..., rule_left] * right[..., rule_right]).max(axis=2)
+        cells = (fired.reshape(batch * m, -1) @ binary).reshape(batch, m, size) > 0
+
+        cells = (cells.astype(np.float32) @ closure) > 0
+        chart[:, starts[:, 0], starts[:, 0] + length - 1] = cells
+
+    return chart[:, 0, n - 1, root] > 0
@@ -5,21 +5,84 @@ Bottom-up parsing algorithm that works with grammars in
 Chomsky Normal Form using dynamic programming.
 """
 
+from .compiled_grammar import compile_grammar
+from .cyk_bitset import BitsetChart, cyk_bitset, cyk_recognize_bitset
 
-def cyk_algorithm(grammar, words):
+
+def _unary_closure(grammar, cell, cell_backpointers):
+    """
+    Close a chart cell under unary rules (A -> B).
+
+    Works in rounds like the original fixed-point loop: a parent found in
+    one round can only trigger more parents in the next round, and when
+    several rules give the same parent, the first rule in grammar order wins.
+    """
+    frontier = list(cell)
+    while frontier:
+        found = {}
+        for child in frontier:
+            for rule_id, head in grammar.unary_parents.get(child, ()):
+                if head not in cell and (head not in found or rule_id < found[head][0]):
+                    found[head] = (rule_id, child)
+
+        for head, (_, child) in found.items():
+            cell.add(head)
+            cell_backpointers[head] = ([child], None)
+        frontier = list(found)
+
+
+def cyk_algorithm(grammar, words, mode="sets", recognize_only=False, all_parses=False):
     """
     Parse a sentence using the CYK algorithm.
 
+    Rules are looked up through the indexes of a CompiledGrammar, so the
+    work per cell depends on the symbols in the cell, not on grammar size.
+
     Args:
-        grammar: Grammar in CNF format (dictionary)
+        grammar: Grammar in CNF format (dictionary or CompiledGrammar)
         words: List of words to parse
+        mode: "sets" stores each cell as a set of symbol names;
+              "bitset" stores each cell as an int mask (see core.cyk_bitset),
+              and parse_table is a BitsetChart that decodes cells on demand
+        recognize_only: If True, only decide validity; parse_table and backpointers
+              are None. Uses the vectorized NumPy engine (core.cyk_numpy), or with
+              mode="bitset" the left-to-right recognizer that stops as soon as the
+              sentence cannot be completed (core.cyk_bitset.cyk_recognize_bitset)
+        all_parses: If True, the third value is a ParseForest (core.parse_forest)
+              with every derivation of 'K' instead of single-best backpointers
 
     Returns:
         Tuple (is_valid, parse_table, backpointers):
             - is_valid: Boolean indicating if sentence is grammatically valid
             - parse_table: 2D table showing parsing process
             - backpointers: 2D table storing derivation info for tree reconstruction
+
+        When a word has no lexical rule the sentence is rejected before any
+        span is combined: is_valid is False and every cell is left empty.
     """
+    if mode not in ("sets", "bitset"):
+        raise ValueError(f"Unknown CYK mode: {mode!r}")
+    grammar = compile_grammar(grammar)
+    if grammar.unknown_words(words):
+        return _rejected(grammar, words, mode, recognize_only, all_parses)
+
+    if recognize_only and mode == "bitset":
+        return cyk_recognize_bitset(grammar, words), None, None
+    if recognize_only:
+        from .cyk_numpy import cyk_recognize_numpy
+        return cyk_recognize_numpy(grammar, words), None, None
+    if all_parses:
+        from .parse_forest import build_parse_forest
+        is_valid, parse_table, _ = (
+            cyk_bitset(grammar, words, with_backpointers=False) if mode == "bitset"
+            else cyk_algorithm(grammar, words, mode=mode)
+        )
+        return is_valid, parse_table, build_parse_forest(grammar, words, parse_table)
+    if mode == "bitset":
+        return cyk_bitset(grammar, words)
+
+    binary_heads = grammar.binary_heads
+
     n = len(words)
     # Initialize parse table
     cyk_table = [[set() for _ in range(n)] for _ in range(n)]
@@ -33,63 +96,141 @@ def cyk_algorithm(grammar, words):
     # Step 1: Fill diagonal with terminal rules (single words)
     for i in range(n):
         word = words[i]
-        for head, bodies in grammar.items():
-            for body in bodies:
-                if len(body) == 1 and body[0] == word:
-                    cyk_table[i][i].add(head)
-                    backpointers[i][i][head] = (['terminal', word], None)
-
-        # Unary closure
-        added = True
-        while added:
-            added = False
-            current_symbols = list(cyk_table[i][i])
-            for head, bodies in grammar.items():
-                for body in bodies:
-                    if len(body) == 1 and body[0] in current_symbols:
-                        if head not in cyk_table[i][i]:
-                            cyk_table[i][i].add(head)
-                            backpointers[i][i][head] = ([body[0]], None)
-                            added = True
+        for head in grammar.terminal_heads.get(word, ()):
+            cyk_table[i][i].add(head)
+            backpointers[i][i][head] = (['terminal', word], None)
+
+        _unary_closure(grammar, cyk_table[i][i], backpointers[i][i])
 
     # Step 2: Binary rules
     for length in range(2, n + 1):
         for i in range(n - length + 1):
             j = i + length - 1
+            cell = cyk_table[i][j]
+            cell_backpointers = backpointers[i][j]
 
-            # Binary rules
+            # Binary rules: smallest split first, then grammar order
             for k in range(i, j):
-                for head, bodies in grammar.items():
-                    for body in bodies:
-                        if len(body) == 2:
-                            B, C = body
-                            if B in cyk_table[i][k] and C in cyk_table[k+1][j]:
-                                if head not in cyk_table[i][j]:
-                                    cyk_table[i][j].add(head)
-                                    backpointers[i][j][head] = ([B, C], k)
-                                else:
-                                    old_body, old_split = backpointers[i][j][head]
-                                    if old_split is None:
-                                        backpointers[i][j][head] = ([B, C], k)
+                left = cyk_table[i][k]
+                right = cyk_table[k + 1][j]
+                if not left or not right:
+                    continue
+
+                found = {}
+                for B in left:
+                    for C in right:
+                        for rule_id, head in binary_heads.get((B, C), ()):
+                            if head not in cell and (head not in found or rule_id < found[head][0]):
+                                found[head] = (rule_id, B, C)
+
+                for head, (_, B, C) in found.items():
+                    cell.add(head)
+                    cell_backpointers[head] = ([B, C], k)
 
             # Unary closure untuk cell (i, j)
-            added = True
-            while added:
-                added = False
-                current_symbols = list(cyk_table[i][j])
-                for head, bodies in grammar.items():
-                    for body in bodies:
-                        if len(body) == 1 and body[0] in current_symbols:
-                            if head not in cyk_table[i][j]:
-                                cyk_table[i][j].add(head)
-                                backpointers[i][j][head] = ([body[0]], None)
-                                added = True
-                            # ← kalau sudah ada, skip total. Tidak ada else.
-
-    is_valid = 'K' in cyk_table[0][n-1]
+            _unary_closure(grammar, cell, cell_backpointers)
+
+    is_valid = n > 0 and 'K' in cyk_table[0][n-1]
     return is_valid, cyk_table, backpointers
 
 
+def _rejected(grammar, words, mode, recognize_only, all_parses):
+    """Result of ``cyk_algorithm`` for a sentence with an unknown word, without parsing."""
+    n = len(words)
+    if recognize_only:
+        return False, None, None
+    if mode == "bitset":
+        table = BitsetChart(grammar, [[0] * n for _ in range(n)])
+    else:
+        table = [[set() for _ in range(n)] for _ in range(n)]
+    if all_parses:
+        from .parse_forest import ParseForest
+        return False, table, ParseForest(words)
+    return False, table, [[{} for _ in range(n)] for _ in range(n)]
+
+
+def _source_cell_backpointers(source, table, words, i, j):
+    """
+    Backpointers of one cell as a CYK pass over ``source`` would set them.
+
+    Uses the already-filled chart of the strict grammar: both grammars
+    derive the same symbols over every span, so only this cell's rule
+    choices (binary rules by split then grammar order, then the unary
+    closure rounds) have to be replayed.
+    """
+    cell = set()
+    cell_backpointers = {}
+
+    if i == j:
+        word = words[i]
+        for head in source.terminal_heads.get(word, ()):
+            cell.add(head)
+            cell_backpointers[head] = (['terminal', word], None)
+    else:
+        for k in range(i, j):
+            left = table[i][k]
+            right = table[k + 1][j]
+            found = {}
+            for B in left:
+                for C in right:
+                    for rule_id, head in source.binary_heads.get((B, C), ()):
+                        if head not in cell and (head not in found or rule_id < found[head][0]):
+                            found[head] = (rule_id, B, C)
+            for head, (_, B, C) in found.items():
+                cell.add(head)
+                cell_backpointers[head] = ([B, C], k)
+
+    _unary_closure(source, cell, cell_backpointers)
+    return cell_backpointers
+
+
+def source_backpointers(grammar, words, parse_table, root='K'):
+    """
+    Backpointers for the tree of ``root`` in terms of the source grammar.
+
+    The strict CNF has no unit rules, so its own backpointers skip symbols
+    such as K1, S, P or NumP -> Num. Instead of parsing a second time with
+    the unit-rule grammar, the rule choices of that grammar are replayed
+    on the strict chart, only for the cells the tree actually visits.
+
+    Args:
+        grammar: CompiledGrammar built with a ``source`` grammar
+        words: List of parsed words
+        parse_table: Chart returned by ``cyk_algorithm`` (sets or BitsetChart)
+        root: Start symbol of the derivation
+
+    Returns:
+        Backpointers in the ``cyk_algorithm`` format, filled for the cells
+        under ``root``; identical to a full CYK pass over ``grammar.source``
+    """
+    n = len(words)
+    backpointers = [[{} for _ in range(n)] for _ in range(n)]
+    source = grammar.source if grammar.source is not None else grammar
+    if n == 0 or root not in parse_table[0][n-1]:
+        return backpointers
+
+    visited = set()
+    stack = [(root, 0, n - 1)]
+    while stack:
+        symbol, i, j = stack.pop()
+        if (i, j) not in visited:
+            visited.add((i, j))
+            backpointers[i][j] = _source_cell_backpointers(source, parse_table, words, i, j)
+        if symbol not in backpointers[i][j]:
+            continue
+
+        body, split = backpointers[i][j][symbol]
+        if body[0] == 'terminal':
+            continue
+        if split is None:
+            stack.append((body[0], i, j))
+        else:
+            stack.append((body[1], split + 1, j))
+            stack.append((body[0], i, split))
+
+    return backpointers
+
+
 def format_cell_content(cell_set):
     """Format parse table cell content for display."""
     if not cell_set:
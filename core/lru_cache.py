@@ -0,0 +1,74 @@
+"""
+Bounded LRU Cache
+
+Small thread-safe least-recently-used cache with hit/miss counters,
+shared by the batch verdict cache and the parse-result cache.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Dictionary-like cache that keeps at most ``maxsize`` entries.
+
+    ``get`` marks an entry as recently used; ``put`` evicts the least
+    recently used entry once the cache is full. All operations take a
+    lock, so one instance can be shared between Streamlit sessions.
+    """
+
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (and count a hit), or ``default``."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Return the cached value for ``key`` without touching LRU order or counters."""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return a dict with size, maxsize, hits and misses."""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,334 @@
+"""
+Packed Parse Forest
+
+All derivations of a sentence, stored without enumerating them. There is
+one node per derivable (symbol, i, j), and each node keeps its list of
+alternatives (body, split) in the backpointer format of ``cyk_algorithm``.
+Subtrees are shared between the alternatives that use them, so the forest
+stays polynomial in sentence length even when the number of trees grows
+exponentially. Parse counts are computed by dynamic programming over the
+nodes, and single trees are picked by index (unranking), so any tree can
+be shown without building the others. ``iter_parse_trees`` walks the same
+forest lazily: nodes are only expanded when a tree reaches them, so the
+first few trees cost about as much as one.
+"""
+
+from .compiled_grammar import compile_grammar
+from .cyk_parser import _source_cell_backpointers
+
+
+def _cell_alternatives(source, table, words, i, j):
+    """
+    Every way each symbol of cell (i, j) can be derived in ``source``.
+
+    Order is deterministic: the choice ``source_backpointers`` makes comes
+    first (so tree 0 is the tree the UI already shows), then the lexical
+    entry, binary rules by split and grammar order, and unary rules by
+    grammar order.
+    """
+    found = {}
+
+    if i == j:
+        word = words[i]
+        for head in source.terminal_heads.get(word, ()):
+            found.setdefault(head, []).append(((0, 0, 0), (['terminal', word], None)))
+    else:
+        for k in range(i, j):
+            left = table[i][k]
+            right = table[k + 1][j]
+            for B in left:
+                for C in right:
+                    for rule_id, head in source.binary_heads.get((B, C), ()):
+                        found.setdefault(head, []).append(((1, k, rule_id), ([B, C], k)))
+
+    cell = table[i][j]
+    for child in cell:
+        for rule_id, head in source.unary_parents.get(child, ()):
+            if head in cell and head != child:
+                found.setdefault(head, []).append(((2, 0, rule_id), ([child], None)))
+
+    best = _source_cell_backpointers(source, table, words, i, j)
+    alternatives = {}
+    for head, entries in found.items():
+        entries.sort(key=lambda entry: entry[0])
+        ordered = [alt for _, alt in entries]
+        chosen = best.get(head)
+        if chosen in ordered:
+            ordered.remove(chosen)
+            ordered.insert(0, chosen)
+        alternatives[head] = ordered
+    return alternatives
+
+
+class _TreeStream:
+    """Trees of one node, produced on demand and memoized (shared by every parent using the node)."""
+
+    def __init__(self, generator):
+        self._generator = generator
+        self._trees = []
+        self._done = False
+        self._busy = False
+
+    def get(self, k):
+        """The k-th tree of the node, or None if it has fewer trees."""
+        # Re-entered through a unary cycle: a derivation that revisits its
+        # own node adds nothing, like in ParseForest.count
+        if self._busy:
+            return None
+        self._busy = True
+        try:
+            while len(self._trees) <= k and not self._done:
+                try:
+                    self._trees.append(next(self._generator))
+                except StopIteration:
+                    self._done = True
+        finally:
+            self._busy = False
+        return self._trees[k] if k < len(self._trees) else None
+
+    def __iter__(self):
+        k = 0
+        while True:
+            tree = self.get(k)
+            if tree is None:
+                return
+            yield tree
+            k += 1
+
+
+class ParseForest:
+    """
+    Packed forest for one sentence.
+
+    - nodes: {(symbol, i, j): [(body, split), ...]}, filled as nodes are
+      expanded (all nodes reachable from the root after expand());
+      body is ['terminal', word], [B] or [B, C]
+    - count(): number of parse trees of the root, by dynamic programming
+    - tree_at(index): backpointers of the index-th tree (0-based), in the
+      n x n format that ``create_parse_tree`` reads
+    - trees(): generator over the same trees in the same order, lazily
+
+    ``counts`` may be a dict shared between forests of the same sentence
+    and chart: it only ever receives finished per-node tree counts (ints),
+    so it can be cached instead of the forest, and a later forest answers
+    count() without expanding any cell.
+    """
+
+    def __init__(self, words, root='K', source=None, parse_table=None, counts=None):
+        self.words = list(words)
+        self.root = root
+        self.nodes = {}
+        self._source = source
+        self._table = parse_table
+        self._cells = {}
+        self._counts = {} if counts is None else counts
+        self._counting = set()
+        self._streams = {}
+
+    def alternatives(self, node):
+        """Alternatives (body, split) of one node, computed on first use."""
+        alternatives = self.nodes.get(node)
+        if alternatives is None:
+            symbol, i, j = node
+            if self._table is None or symbol not in self._table[i][j]:
+                return []
+            if (i, j) not in self._cells:
+                self._cells[(i, j)] = _cell_alternatives(self._source, self._table, self.words, i, j)
+            alternatives = self.nodes[node] = self._cells[(i, j)].get(symbol, [])
+        return alternatives
+
+    def expand(self):
+        """Expand every node reachable from the root."""
+        if not self.words:
+            return self
+        seen = set()
+        stack = [self.root_node]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            symbol, i, j = node
+            for body, split in self.alternatives(node):
+                stack.extend(self._children(body, split, i, j))
+        return self
+
+    @property
+    def root_node(self):
+        return (self.root, 0, len(self.words) - 1)
+
+    def _children(self, body, split, i, j):
+        if body[0] == 'terminal':
+            return ()
+        if split is None:
+            return ((body[0], i, j),)
+        return ((body[0], i, split), (body[1], split + 1, j))
+
+    def _alternative_counts(self, node):
+        """[(alternative, [child counts], product)] of one node, counts memoized."""
+        symbol, i, j = node
+        result = []
+        for body, split in self.alternatives(node):
+            child_counts = [self._count(child) for child in self._children(body, split, i, j)]
+            product = 1
+            for c in child_counts:
+                product *= c
+            result.append(((body, split), child_counts, product))
+        return result
+
+    def _count(self, node):
+        if node in self._counts:
+            return self._counts[node]
+        # While the node is being counted, a unary cycle back to it derives
+        # nothing new, so that alternative counts as 0
+        if node in self._counting:
+            return 0
+        self._counting.add(node)
+        try:
+            total = sum(product for _, _, product in self._alternative_counts(node))
+        finally:
+            self._counting.discard(node)
+        self._counts[node] = total
+        return total
+
+    def count(self, symbol=None, i=0, j=None):
+        """Number of parse trees of ``symbol`` over (i, j); defaults to the root over the sentence."""
+        if not self.words:
+            return 0
+        node = (symbol or self.root, i, len(self.words) - 1 if j is None else j)
+        return self._count(node)
+
+    def tree_at(self, index):
+        """
+        Backpointers of the ``index``-th parse tree (0-based).
+
+        Trees are numbered in alternative order: the first alternative of
+        the root covers indexes 0 .. its count - 1, and so on; inside a
+        binary alternative the right child varies fastest.
+
+        Raises:
+            IndexError: if index is outside 0 .. count() - 1
+        """
+        total = self.count()
+        if not 0 <= index < total:
+            raise IndexError(f"parse index {index} out of range (0..{total - 1})")
+
+        n = len(self.words)
+        backpointers = [[{} for _ in range(n)] for _ in range(n)]
+        stack = [(self.root_node, index)]
+        while stack:
+            node, index = stack.pop()
+            symbol, i, j = node
+            for (body, split), child_counts, product in self._alternative_counts(node):
+                if index >= product:
+                    index -= product
+                    continue
+                backpointers[i][j][symbol] = (body, split)
+                children = self._children(body, split, i, j)
+                # Mixed radix: the last child varies fastest
+                for child, child_count in reversed(list(zip(children, child_counts))):
+                    index, child_index = divmod(index, child_count)
+                    stack.append((child, child_index))
+                break
+        return backpointers
+
+    def _stream(self, node):
+        stream = self._streams.get(node)
+        if stream is None:
+            stream = self._streams[node] = _TreeStream(self._generate(node))
+        return stream
+
+    def _generate(self, node):
+        """Trees of one node as nested (node, alternative, subtrees), in tree_at order."""
+        symbol, i, j = node
+        for body, split in self.alternatives(node):
+            children = self._children(body, split, i, j)
+            if not children:
+                yield (node, (body, split), ())
+            elif len(children) == 1:
+                for sub in self._stream(children[0]):
+                    yield (node, (body, split), (sub,))
+            else:
+                left, right = self._stream(children[0]), self._stream(children[1])
+                for sub_left in left:
+                    for sub_right in right:
+                        yield (node, (body, split), (sub_left, sub_right))
+
+    def _to_backpointers(self, tree):
+        n = len(self.words)
+        backpointers = [[{} for _ in range(n)] for _ in range(n)]
+        stack = [tree]
+        while stack:
+            (symbol, i, j), alternative, subtrees = stack.pop()
+            backpointers[i][j][symbol] = alternative
+            stack.extend(subtrees)
+        return backpointers
+
+    def trees(self):
+        """
+        Yield the backpointers of every parse tree of the root, one at a time.
+
+        Same trees in the same order as tree_at(0), tree_at(1), ... but
+        without counting first: each node's subtrees are produced only
+        when a tree needs them and then shared, so stopping after a few
+        trees leaves the rest of the forest unexplored.
+        """
+        if not self.words:
+            return
+        for tree in self._stream(self.root_node):
+            yield self._to_backpointers(tree)
+
+    def __len__(self):
+        """Number of expanded nodes (memory size of the forest, not the number of trees)."""
+        return len(self.nodes)
+
+
+def _lazy_forest(grammar, words, parse_table, root, counts=None):
+    grammar = compile_grammar(grammar)
+    source = grammar.source if grammar.source is not None else grammar
+    return ParseForest(words, root, source=source, parse_table=parse_table, counts=counts)
+
+
+def build_parse_forest(grammar, words, parse_table, root='K', expand=True, counts=None):
+    """
+    Build the packed forest of ``root`` over a filled chart.
+
+    Args:
+        grammar: CompiledGrammar; its ``source`` grammar (with unit rules)
+                 is used, like in ``source_backpointers``
+        words: List of parsed words
+        parse_table: Chart returned by ``cyk_algorithm`` (sets or BitsetChart)
+        root: Start symbol
+        expand: If False, cells are expanded only when count(), tree_at()
+              or trees() reach them
+        counts: Per-node tree counts of an earlier forest over the same
+              sentence and chart (see ParseForest), reused and extended
+
+    Returns:
+        ParseForest with every node reachable from ``root`` expanded
+        (empty, with count() == 0, when the sentence is invalid)
+    """
+    forest = _lazy_forest(grammar, words, parse_table, root, counts)
+    return forest.expand() if expand else forest
+
+
+def iter_parse_trees(grammar, words, parse_table, root='K'):
+    """
+    Lazily yield the parse trees of ``root`` over (0, n-1), one at a time.
+
+    Each item is an n x n backpointer table, accepted as is by
+    ``create_parse_tree``. The order is deterministic and the first tree
+    is the one ``source_backpointers`` picks. Cells are only expanded when
+    a tree reaches them, so taking the first k trees (e.g. with
+    itertools.islice) costs about as much as building those k trees.
+
+    Args:
+        grammar: CompiledGrammar built with a ``source`` grammar
+        words: List of parsed words
+        parse_table: Chart returned by ``cyk_algorithm`` (sets or BitsetChart)
+        root: Start symbol
+
+    Returns:
+        Generator of backpointer tables (nothing when the sentence is invalid)
+    """
+    return _lazy_forest(grammar, words, parse_table, root).trees()
@@ -69,8 +69,10 @@ def create_parse_tree(words, parse_table, grammar, backpointers, theme="standard
         return node_id
 
     n = len(words)
+    # Tanpa tabel (pohon dari iter_parse_trees), cukup cek akar di backpointers
+    root_cell = parse_table[0][n-1] if parse_table is not None and n > 0 else None
     try:
-        if n > 0 and 'K' in parse_table[0][n-1]:
+        if n > 0 and 'K' in (root_cell if root_cell is not None else backpointers[0][n-1]):
             build('K', 0, n-1, y=0)
         else:
             add_node('Parse Failed', 0, 0)
@@ -1 +1,12 @@
-from .cfg_rules import RULES_CFG
\ No newline at end of file
+from .lexicon_index import LexiconIndex, load_lexicon_index
+from .cfg_rules import get_rules_cfg, grammar_fingerprint
+from .compiled_cache import load_compiled_grammar
+from .stemmer import (
+    bersihkan_dan_stem_bali, normalisasi_kalimat, normalisasi_kolom, stem_kalimat_batch, stem_kata_bali,
+)
+
+def __getattr__(name):
+    # RULES_CFG is built on first access (it reads the lexicon)
+    if name == "RULES_CFG":
+        return get_rules_cfg()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
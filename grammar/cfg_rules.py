@@ -1,27 +1,17 @@
+import hashlib
 import json
-import os
 import sys
 
-# 1. Path Configuration and Loader Lexicon
-def get_lexicon_path():
-    """Giving the absolute path to the lexicon file, which is located in the parent directory's 'scraping' folder."""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_dir, "..", "scraping", "balinese_lexicon.json")
+from .lexicon_index import get_lexicon_path, load_lexicon_index
 
+# 1. Loader Lexicon
 def load_lexicon():
     """
-    Reads the JSON file and returns a dictionary of terminal rules.
+    Builds the terminal rules from the shared LexiconIndex (the JSON file is parsed once per process).
     Result format: {'Noun': [['word1'], ['word2']], ...}
     """
-    json_path = get_lexicon_path()
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        sys.stderr.write(f"ERROR: Lexicon file is not found at {json_path}\n")
-        return {}
-    except json.JSONDecodeError as e:
-        sys.stderr.write(f"ERROR: JSON format invalid: {e}\n")
+    index = load_lexicon_index()
+    if not index.data:
         return {}
 
     # List of Categorical Lexicon that use in CFG
@@ -32,9 +22,9 @@ def load_lexicon():
 
     rules = {}
     for cat in lexical_categories:
-        if cat in data:
+        if cat in index.data:
             # For each Balinese word (key), convert it into a single-element list
-            rules[cat] = [[word] for word in data[cat].keys()]
+            rules[cat] = [[word] for word in index.words_in(cat)]
         else:
             sys.stderr.write(f"WARNING: Category '{cat}' is not found in the JSON file.\n")
             rules[cat] = []
@@ -84,14 +74,59 @@ SYNTAX_RULES = {
 }
 
 # 3. Merge and Export
-LEXICON_RULES = load_lexicon()
+# Built on first use, so importing the grammar package does not read the lexicon
+_LEXICON_RULES = None
+_RULES_CFG = None
+_FINGERPRINT = None
+
+def get_lexicon_rules():
+    """Returns the terminal rules, loading the lexicon on the first call."""
+    global _LEXICON_RULES
+    if _LEXICON_RULES is None:
+        _LEXICON_RULES = load_lexicon()
+    return _LEXICON_RULES
+
+def get_rules_cfg():
+    """Returns syntax + lexicon rules merged into a single dictionary for CFG processing."""
+    global _RULES_CFG
+    if _RULES_CFG is None:
+        _RULES_CFG = {**SYNTAX_RULES, **get_lexicon_rules()}
+    return _RULES_CFG
+
+def __getattr__(name):
+    # LEXICON_RULES / RULES_CFG stay importable as module constants
+    if name == "LEXICON_RULES":
+        return get_lexicon_rules()
+    if name == "RULES_CFG":
+        return get_rules_cfg()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def grammar_fingerprint():
+    """
+    Returns a short hash of SYNTAX_RULES plus the raw lexicon file.
+    Any change to the rules or to balinese_lexicon.json gives a new value,
+    so caches keyed on it never mix results of different grammars.
+
+    Computed once per process, like the rules and the lexicon themselves:
+    after editing the grammar or the lexicon file, restart the server
+    (on-disk caches such as the compiled CNF pick up the new value then).
+    """
+    global _FINGERPRINT
+    if _FINGERPRINT is None:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(SYNTAX_RULES, sort_keys=True).encode("utf-8"))
+        try:
+            with open(get_lexicon_path(), "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            pass
+        _FINGERPRINT = digest.hexdigest()[:16]
+    return _FINGERPRINT
 
-# Merge syntax + lexicon rules into a single dictionary for CFG processing
-RULES_CFG = {**SYNTAX_RULES, **LEXICON_RULES}
 # 4. Optional: Helper Function for Validation
 def validate_cfg():
     """Checks if all lexical categories have at least one entry."""
-    missing = [cat for cat, words in LEXICON_RULES.items() if not words]
+    missing = [cat for cat, words in get_lexicon_rules().items() if not words]
     if missing:
         sys.stderr.write(f"WARNING: The following categories are empty: {', '.join(missing)}\n")
     else:
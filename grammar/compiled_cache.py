@@ -0,0 +1,77 @@
+import os
+import pickle
+import sys
+import tempfile
+
+from core import compile_grammar, convert_to_cnf, remove_epsilon_productions, remove_unit_productions
+from core.compiled_grammar import COMPILED_FORMAT_VERSION
+from .cfg_rules import get_rules_cfg, grammar_fingerprint
+
+# 1. Cache Location
+def get_cache_dir():
+    """Directory for generated artifacts (git-ignored), next to 'scraping' in the project root."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "..", ".cache")
+
+def get_cache_path():
+    """Cache file name carries the grammar fingerprint, so a changed grammar never hits an old file."""
+    name = f"cnf_{grammar_fingerprint()}_v{COMPILED_FORMAT_VERSION}.pickle"
+    return os.path.join(get_cache_dir(), name)
+
+# 2. Build / Load
+def build_compiled_grammar():
+    """
+    Runs the full normalization over the merged CFG (syntax + lexicon).
+    Returns the strict CNF as a CompiledGrammar whose source is the
+    epsilon-free grammar (still with unit rules) used for tree display.
+    """
+    cfg_no_eps = remove_epsilon_productions(get_rules_cfg())
+    cfg_strict = remove_unit_productions(cfg_no_eps)
+    grammar = compile_grammar(convert_to_cnf(cfg_strict), source=cfg_no_eps)
+
+    # Build the lazy rule tables now so they are stored in the cache as well
+    grammar.bitset_tables()
+    from core.cyk_numpy import numpy_tables
+    numpy_tables(grammar)
+    return grammar
+
+def _read_cache(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        sys.stderr.write(f"WARNING: Ignoring unreadable grammar cache {path}: {e}\n")
+        return None
+
+def _write_cache(path, grammar):
+    """Write to a temp file first and rename, so a crash never leaves half a pickle."""
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(grammar, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        sys.stderr.write(f"WARNING: Could not write grammar cache {path}: {e}\n")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+_COMPILED = None
+
+def load_compiled_grammar():
+    """
+    Returns the compiled strict CNF grammar, loading it lazily.
+    Order: in-memory copy -> cache file for the current fingerprint -> full rebuild (then saved).
+    """
+    global _COMPILED
+    if _COMPILED is None:
+        path = get_cache_path()
+        grammar = _read_cache(path)
+        if grammar is None:
+            grammar = build_compiled_grammar()
+            _write_cache(path, grammar)
+        _COMPILED = grammar
+    return _COMPILED
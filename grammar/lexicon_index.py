@@ -0,0 +1,418 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+# Bump whenever the binary layout below changes; old files are then ignored
+LEXICON_FORMAT_VERSION = 1
+_MAGIC = b"BLEX"
+
+# Binary layout: header, then one 4-byte aligned section per name below.
+# All sections are native-order uint32 arrays except the two byte sections.
+# The file lives in the machine-local .cache directory, so native order is fine.
+#   str_offsets  : string i is strings[str_offsets[i]:str_offsets[i + 1]] (UTF-8)
+#                  ids 0..n_words-1 are the raw words, sorted by their bytes
+#   word_cats    : category bitflags per word (bit c = category id c)
+#   cat_names    : string id of each category name, in JSON order
+#   cat_starts   : category c owns cat_words/cat_trans[cat_starts[c]:cat_starts[c + 1]]
+#   cat_words    : word ids of each category, in JSON order
+#   cat_trans    : string id of the translation of each cat_words entry
+#   pair_keys    : sorted word_id * 32 + cat_id, for (word, category) -> translation
+#   pair_trans   : translation string id of each pair_keys entry
+#   node_edges   : trie node n owns edges[node_edges[n]:node_edges[n + 1]]
+#   node_end     : 1 if a base form ends at the node
+#   edge_chars   : code point of each edge, sorted within a node
+#   edge_children: target node of each edge
+_SECTIONS = (
+    "str_offsets", "strings", "word_cats", "cat_names", "cat_starts", "cat_words",
+    "cat_trans", "pair_keys", "pair_trans", "node_edges", "node_end", "edge_chars",
+    "edge_children",
+)
+_BYTE_SECTIONS = {"strings", "node_end"}
+_HEADER = struct.Struct("<4s3I" + "2I" * len(_SECTIONS))
+_MAX_CATEGORIES = 32
+
+# Key in a decoded trie node that marks "a base word ends here"
+_END = ""
+
+def encode_lexicon(data):
+    """
+    Turns the raw lexicon dict ({category: {word: translation}}) into the
+    compact binary format read by LexiconIndex.
+    """
+    categories = [(cat, entries) for cat, entries in data.items() if isinstance(entries, dict)]
+    if len(categories) > _MAX_CATEGORIES:
+        raise ValueError(f"Lexicon has {len(categories)} categories, the format holds {_MAX_CATEGORIES}")
+
+    words = sorted({word for _, entries in categories for word in entries}, key=lambda w: w.encode("utf-8"))
+    word_ids = {word: i for i, word in enumerate(words)}
+
+    strings = list(words)
+    string_ids = {}
+
+    def intern(text):
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    word_cats = array("I", bytes(4 * len(words)))
+    cat_names, cat_starts, cat_words, cat_trans = array("I"), array("I", [0]), array("I"), array("I")
+    pairs = {}
+    for cat_id, (cat, entries) in enumerate(categories):
+        cat_names.append(intern(cat))
+        for word, translation in entries.items():
+            word_id = word_ids[word]
+            trans_id = intern("" if translation is None else str(translation))
+            word_cats[word_id] |= 1 << cat_id
+            cat_words.append(word_id)
+            cat_trans.append(trans_id)
+            pairs[word_id * _MAX_CATEGORIES + cat_id] = trans_id
+        cat_starts.append(len(cat_words))
+
+    # Base forms (lowercased, stripped) go into a trie flattened breadth-first
+    trie = {}
+    bases = set()
+    for word in words:
+        base = word.lower().strip()
+        bases.add(base)
+        node = trie
+        for ch in base:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    node_edges, node_end, edge_chars, edge_children = array("I", [0]), bytearray(), array("I"), array("I")
+    queue = [trie]
+    for node in queue:
+        node_end.append(1 if "" in node else 0)
+        for ch in sorted((ch for ch in node if ch), key=ord):
+            edge_chars.append(ord(ch))
+            edge_children.append(len(queue))
+            queue.append(node[ch])
+        node_edges.append(len(edge_chars))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = array("I", [0])
+    for raw in encoded:
+        str_offsets.append(str_offsets[-1] + len(raw))
+
+    sections = {
+        "str_offsets": str_offsets,
+        "strings": b"".join(encoded),
+        "word_cats": word_cats,
+        "cat_names": cat_names,
+        "cat_starts": cat_starts,
+        "cat_words": cat_words,
+        "cat_trans": cat_trans,
+        "pair_keys": array("I", sorted(pairs)),
+        "pair_trans": array("I", [pairs[key] for key in sorted(pairs)]),
+        "node_edges": node_edges,
+        "node_end": bytes(node_end),
+        "edge_chars": edge_chars,
+        "edge_children": edge_children,
+    }
+
+    body = bytearray()
+    spans = []
+    for name in _SECTIONS:
+        section = sections[name]
+        raw = section.tobytes() if isinstance(section, array) else bytes(section)
+        count = len(section)
+        body += bytes(-(_HEADER.size + len(body)) % 4)
+        spans += [_HEADER.size + len(body), count]
+        body += raw
+
+    header = _HEADER.pack(_MAGIC, LEXICON_FORMAT_VERSION, len(words), len(bases), *spans)
+    return header + bytes(body)
+
+class _CategoryView(Mapping):
+    """Read-only {word: translation} view of one category, in file order."""
+
+    def __init__(self, index, cat_id):
+        self._index = index
+        self._cat_id = cat_id
+        self._start = index._cat_starts[cat_id]
+        self._stop = index._cat_starts[cat_id + 1]
+
+    def __getitem__(self, word):
+        translation = self._index._pair_translation(word, self._cat_id)
+        if translation is None:
+            raise KeyError(word)
+        return translation
+
+    def __contains__(self, word):
+        return self._index._pair_translation(word, self._cat_id) is not None
+
+    def __iter__(self):
+        index = self._index
+        for pos in range(self._start, self._stop):
+            yield index._string(index._cat_words[pos])
+
+    def __len__(self):
+        return self._stop - self._start
+
+class _LexiconView(Mapping):
+    """Read-only {category: {word: translation}} view with the shape of balinese_lexicon.json."""
+
+    def __init__(self, index):
+        self._categories = {
+            index._string(name_id): _CategoryView(index, cat_id)
+            for cat_id, name_id in enumerate(index._cat_names)
+        }
+
+    def __getitem__(self, category):
+        return self._categories[category]
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+class LexiconIndex:
+    """
+    One index over balinese_lexicon.json, read straight from the compact
+    binary file written by encode_lexicon (usually an mmap, so every
+    Streamlit worker shares the same pages through the OS cache and
+    nothing is parsed at start-up).
+
+    - data: read-only view with the same shape as the JSON dict
+    - categories(word): lexical categories of a raw lexicon word
+    - translation(word): Indonesian gloss of a word, or None
+    - `word in index`: is `word` a base form (keys lowercased and stripped,
+      same normalization as the old KATA_DASAR_CORPUS set)
+    - base_ends(text, start, lead): one trie walk that returns every end
+      position where lead + text[start:end] is a base form, which is what
+      affix stripping needs (O(word length) instead of one slice per affix)
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Lexicon file is truncated")
+        magic, version, self._n_words, self._n_bases, *spans = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != LEXICON_FORMAT_VERSION:
+            raise ValueError("Lexicon file has an unknown format")
+
+        for i, name in enumerate(_SECTIONS):
+            offset, count = spans[2 * i], spans[2 * i + 1]
+            if name in _BYTE_SECTIONS:
+                section = view[offset:offset + count]
+            else:
+                section = view[offset:offset + 4 * count].cast("I")
+            if len(section) != count:
+                raise ValueError("Lexicon file is truncated")
+            setattr(self, "_" + name, section)
+
+        # Trie nodes become dicts as the stemmer visits them (see _decode_node)
+        self._root = self._decode_node(0)
+        self.data = _LexiconView(self)
+
+    @classmethod
+    def from_data(cls, data):
+        """Builds an in-memory index straight from the raw lexicon dict."""
+        return cls(encode_lexicon(data))
+
+    def __reduce__(self):
+        # memoryviews do not pickle; ship the bytes and re-wrap them
+        return (LexiconIndex, (bytes(self._buffer),))
+
+    def _string(self, string_id):
+        return bytes(self._strings[self._str_offsets[string_id]:self._str_offsets[string_id + 1]]).decode("utf-8")
+
+    def _word_id(self, word):
+        """Binary search over the sorted raw words → word id, or -1."""
+        key = word.encode("utf-8")
+        offsets, strings = self._str_offsets, self._strings
+        lo, hi = 0, self._n_words
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if strings[offsets[mid]:offsets[mid + 1]].tobytes() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_words and strings[offsets[lo]:offsets[lo + 1]].tobytes() == key:
+            return lo
+        return -1
+
+    def _pair_translation(self, word, cat_id):
+        word_id = self._word_id(word) if isinstance(word, str) else -1
+        if word_id < 0 or not self._word_cats[word_id] >> cat_id & 1:
+            return None
+        key = word_id * _MAX_CATEGORIES + cat_id
+        pos = bisect_left(self._pair_keys, key)
+        return self._string(self._pair_trans[pos])
+
+    def _decode_node(self, node):
+        """
+        One trie node as a dict {char: child}, with the "" key when a base form ends here.
+        Children start as node numbers and are swapped for their dict on first visit,
+        so only the part of the trie the stemmer actually walks becomes Python objects.
+        """
+        edges = range(self._node_edges[node], self._node_edges[node + 1])
+        decoded = {chr(self._edge_chars[e]): self._edge_children[e] for e in edges}
+        if self._node_end[node]:
+            decoded[_END] = True
+        return decoded
+
+    def _step(self, node, ch):
+        child = node.get(ch)
+        if child.__class__ is int:
+            child = node[ch] = self._decode_node(child)
+        return child
+
+    def _walk(self, text):
+        """Trie node (dict) reached by `text` from the root, or None."""
+        node = self._root
+        for ch in text:
+            node = self._step(node, ch)
+            if node is None:
+                return None
+        return node
+
+    def categories(self, word):
+        """Returns the tuple of categories of a raw lexicon word (empty tuple if unknown)."""
+        word_id = self._word_id(word)
+        if word_id < 0:
+            return ()
+        flags = self._word_cats[word_id]
+        return tuple(name for cat_id, name in enumerate(self.data) if flags >> cat_id & 1)
+
+    def translation(self, word):
+        """Returns the Indonesian gloss of a raw lexicon word (first category in file order), or None."""
+        word_id = self._word_id(word)
+        if word_id < 0:
+            return None
+        flags = self._word_cats[word_id]
+        first = (flags & -flags).bit_length() - 1
+        return self._pair_translation(word, first)
+
+    def words_in(self, category):
+        """Returns the raw words of one category, in file order."""
+        return list(self.data.get(category, ()))
+
+    def base_ends(self, text, start=0, lead=""):
+        """
+        Walks the trie once along lead + text[start:].
+        Returns the set of end indexes `end` (into `text`) such that
+        lead + text[start:end] is a base form.
+        """
+        node = self._walk(lead)
+        if node is None:
+            return set()
+
+        ends = set()
+        if _END in node:
+            ends.add(start)
+        for pos in range(start, len(text)):
+            child = node.get(text[pos])
+            if child is None:
+                break
+            if child.__class__ is int:
+                child = self._step(node, text[pos])
+            node = child
+            if _END in node:
+                ends.add(pos + 1)
+        return ends
+
+    def __contains__(self, word):
+        if not isinstance(word, str):
+            return False
+        node = self._walk(word)
+        return node is not None and _END in node
+
+    def __len__(self):
+        return self._n_bases
+
+    def __iter__(self):
+        stack = [(0, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if self._node_end[node]:
+                yield prefix
+            for edge in range(self._node_edges[node], self._node_edges[node + 1]):
+                stack.append((self._edge_children[edge], prefix + chr(self._edge_chars[edge])))
+
+def get_lexicon_path():
+    """Giving the absolute path to the lexicon file, which is located in the parent directory's 'scraping' folder."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "..", "scraping", "balinese_lexicon.json")
+
+def read_lexicon_json():
+    """Reads balinese_lexicon.json → raw dict ({} with a message on stderr if missing/invalid)."""
+    json_path = get_lexicon_path()
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        sys.stderr.write(f"ERROR: Lexicon file is not found at {json_path}\n")
+        return {}
+    except json.JSONDecodeError as e:
+        sys.stderr.write(f"ERROR: JSON format invalid: {e}\n")
+        return {}
+
+def get_lexicon_store_path():
+    """Binary lexicon in the cache dir, named after a hash of the JSON bytes (None if the JSON is missing)."""
+    from .compiled_cache import get_cache_dir
+
+    try:
+        with open(get_lexicon_path(), "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    except FileNotFoundError:
+        return None
+    return os.path.join(get_cache_dir(), f"lexicon_{digest}_v{LEXICON_FORMAT_VERSION}.bin")
+
+def _map_store(path):
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return LexiconIndex(buffer)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"WARNING: Ignoring unreadable lexicon file {path}: {e}\n")
+        return None
+
+def _write_store(path, blob):
+    """Write to a temp file first and rename, so a crash never leaves half a file."""
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        sys.stderr.write(f"WARNING: Could not write lexicon file {path}: {e}\n")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+_INDEX = None
+
+def load_lexicon_index():
+    """
+    Returns the shared LexiconIndex.
+    Order: in-memory copy -> mmap of the binary file for the current JSON ->
+    encode the JSON once, write the binary file, then mmap it.
+    """
+    global _INDEX
+    if _INDEX is None:
+        path = get_lexicon_store_path()
+        index = _map_store(path) if path else None
+        if index is None:
+            blob = encode_lexicon(read_lexicon_json())
+            if path and _write_store(path, blob):
+                index = _map_store(path)
+            if index is None:
+                index = LexiconIndex(blob)
+        _INDEX = index
+    return _INDEX
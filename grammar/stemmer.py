@@ -0,0 +1,198 @@
+"""
+Stemmer Bahasa Bali
+
+Mengupas imbuhan (akhiran, awalan, gabungan, nasalisasi) berdasarkan
+kamus kata dasar (LexiconIndex). Tidak bergantung pada Streamlit, jadi
+bisa dipakai oleh app, batch processor, maupun CLI.
+
+- Daftar imbuhan & aturan nasalisasi disusun sekali saat modul di-import
+  (dikelompokkan per huruf awal/akhir), bukan di setiap panggilan
+- Hasil per kata di-memo (LRU terbatas, STEM_CACHE_SIZE): kata yang sama
+  di kalimat lain tidak dikupas ulang
+- stem_kalimat_batch: satu kolom kalimat sekaligus, kalimat kembar cukup sekali
+- normalisasi_kalimat / normalisasi_kolom: lowercase, lipat ke ASCII (NFKD
+  tanpa karakter non-ASCII), buang '.' ','; versi kolom memproses seluruh
+  kolom sebagai satu string
+"""
+
+import unicodedata
+from functools import lru_cache
+
+# Jumlah kata (per kamus) yang hasil stem-nya disimpan
+STEM_CACHE_SIZE = 100_000
+
+KATA_PENGECUALIAN = frozenset(["petang", "patang", "telung", "limang"])
+
+# Urutan = prioritas pengupasan
+AKHIRAN = ("ang", "ne", "in", "an", "a", "e")
+AWALAN = ("ma", "ka", "pa", "sa", "di", "a")
+
+# Awalan nasal → huruf asli yang dicoba (urutan = prioritas); "" = cukup dihapus
+NASALISASI = {
+    "ng": ("",),
+    "ny": ("j", "c", "s"),
+    "m": ("b", "p"),
+    "n": ("t", "d"),
+}
+
+
+# Pemisah antar kalimat saat satu kolom dinormalisasi sebagai satu string
+# (tidak berubah oleh lower/NFKD/encode ASCII)
+_PEMISAH = "\x00"
+
+
+def normalisasi_kalimat(kalimat):
+    """
+    Kalimat mentah → teks siap stem: lowercase, strip, lipat ke ASCII (NFKD,
+    karakter non-ASCII dibuang), tanpa '.' dan ','.
+    """
+    kalimat = unicodedata.normalize('NFKD', kalimat.lower().strip()).encode('ASCII', 'ignore').decode('utf-8')
+    return kalimat.replace(".", "").replace(",", "")
+
+
+def normalisasi_kolom(kalimat_list):
+    """
+    normalisasi_kalimat untuk satu kolom sekaligus → list, urutan sama.
+
+    Semua kalimat digabung jadi satu string, sehingga lower, NFKD, encode
+    ASCII dan penghapusan '.' ',' masing-masing cukup satu panggilan C untuk
+    seluruh kolom. NFKD bekerja per karakter, jadi hasilnya sama dengan
+    per kalimat; bedanya hanya spasi di tepi tidak di-strip (split() di
+    bersihkan_dan_stem_bali membuangnya, hasil stem tetap sama).
+
+    Item non-str (mis. NaN dari sel kosong) dijadikan str(item) di sini,
+    jadi pemanggil boleh mengirim nilai sel mentah.
+    """
+    kalimat_list = [str(kalimat) for kalimat in kalimat_list]
+    if not kalimat_list:
+        return []
+    gabungan = _PEMISAH.join(kalimat_list)
+    if gabungan.count(_PEMISAH) != len(kalimat_list) - 1:
+        # Pemisah muncul di dalam kalimat → tidak bisa dipecah ulang dengan aman
+        return [normalisasi_kalimat(kalimat) for kalimat in kalimat_list]
+
+    gabungan = unicodedata.normalize('NFKD', gabungan.lower()).encode('ASCII', 'ignore').decode('ascii')
+    return gabungan.replace(".", "").replace(",", "").split(_PEMISAH)
+
+
+def _kelompokkan(imbuhan, posisi):
+    """{huruf: imbuhan yang diawali/diakhiri huruf itu}, urutan prioritas tetap."""
+    kelompok = {}
+    for item in imbuhan:
+        kelompok.setdefault(item[posisi], []).append(item)
+    return {huruf: tuple(items) for huruf, items in kelompok.items()}
+
+
+_AKHIRAN_PER_HURUF = _kelompokkan(AKHIRAN, -1)
+_AWALAN_PER_HURUF = _kelompokkan(AWALAN, 0)
+
+
+def _awalan_nasal(kata):
+    """Awalan nasal yang menempel (yang terpanjang: ng-/ny- menutup n-), atau None."""
+    if kata.startswith(("ng", "ny")):
+        return kata[:2]
+    if kata.startswith("m"):
+        # m- hanya dikupas dari kata yang lebih dari 2 huruf
+        return "m" if len(kata) > 2 else None
+    if kata.startswith("n"):
+        return "n"
+    return None
+
+
+def stem_kata_bali(kata, kamus_dasar):
+    """
+    Menganalisis 1 kata dan mencoba mengupas imbuhan bahasa Bali
+    (Akhiran, Awalan, Gabungan, dan Nasalisasi) untuk mencari kata dasarnya.
+    kamus_dasar: LexiconIndex — kandidat kata dasar dicari lewat trie,
+    satu kali jalan per posisi awal, bukan satu slice per kombinasi imbuhan.
+    Hasil per (kata, kamus) di-memo.
+    """
+    return _stem_kata_memo(kata, kamus_dasar)
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def _stem_kata_memo(kata, kamus_dasar):
+    if kata in KATA_PENGECUALIAN:
+        return kata, None
+
+    n = len(kata)
+    # Satu jalan trie dari awal kata: sekaligus cek kata dasar utuh dan kandidat akhiran
+    ends_awal = kamus_dasar.base_ends(kata)
+    if n in ends_awal:
+        return kata, None
+
+    # Imbuhan yang benar-benar menempel (urutan prioritas tetap sama)
+    suf_cocok = [suf for suf in _AKHIRAN_PER_HURUF.get(kata[-1:], ()) if kata.endswith(suf)]
+    pref_cocok = [pref for pref in _AWALAN_PER_HURUF.get(kata[:1], ()) if kata.startswith(pref)]
+
+    for suf in suf_cocok:
+        if n - len(suf) in ends_awal:
+            k_dasar = kata[:-len(suf)]
+            return k_dasar, f"**{kata}** ➡️ {k_dasar} (Hapus akhiran -{suf})"
+
+    ends_pref = {pref: kamus_dasar.base_ends(kata, len(pref)) for pref in pref_cocok}
+
+    for pref in pref_cocok:
+        if n in ends_pref[pref]:
+            k_dasar = kata[len(pref):]
+            return k_dasar, f"**{kata}** ➡️ {k_dasar} (Hapus awalan {pref}-)"
+
+    for pref in pref_cocok:
+        for suf in suf_cocok:
+            end = n - len(suf)
+            # end < awal → slice kosong, sama seperti kata[len(pref):-len(suf)]
+            if (end in ends_pref[pref]) if end >= len(pref) else (0 in ends_awal):
+                k_dasar = kata[len(pref):-len(suf)]
+                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Hapus {pref}- dan -{suf})"
+
+    nasal = _awalan_nasal(kata)
+    if nasal is not None:
+        for huruf_asli in NASALISASI[nasal]:
+            if n in kamus_dasar.base_ends(kata, len(nasal), lead=huruf_asli):
+                k_dasar = huruf_asli + kata[len(nasal):]
+                if not huruf_asli:
+                    return k_dasar, f"**{kata}** ➡️ {k_dasar} (Nasalisasi {nasal}-)"
+                return k_dasar, f"**{kata}** ➡️ {k_dasar} (Nasalisasi {nasal}- menjadi {huruf_asli}-)"
+
+    return kata, None
+
+
+def bersihkan_dan_stem_bali(kalimat, kamus_dasar):
+    kalimat = kalimat.replace(".", "").replace(",", "")
+    kata_kata = kalimat.split()
+
+    hasil_bersih = []
+    log_perubahan = []
+
+    for kata in kata_kata:
+        kata_dasar, catatan = _stem_kata_memo(kata, kamus_dasar)
+        hasil_bersih.append(kata_dasar)
+        if catatan:
+            log_perubahan.append(catatan)
+
+    return " ".join(hasil_bersih), log_perubahan
+
+
+def stem_kalimat_batch(kalimat_list, kamus_dasar, stemmer_func=bersihkan_dan_stem_bali):
+    """
+    Stem satu kolom kalimat sekaligus → list (kalimat_hasil, log_perubahan), urutan sama dengan input.
+    Kalimat yang berulang hanya di-stem sekali (hasilnya dipakai bersama).
+    Nilai non-str (mis. NaN dari sel kosong) di-stem sebagai str(nilai).
+    - stemmer_func: fungsi per kalimat dengan signature bersihkan_dan_stem_bali
+    """
+    kalimat_list = [str(kalimat) for kalimat in kalimat_list]
+    hasil = {}
+    for kalimat in kalimat_list:
+        if kalimat not in hasil:
+            hasil[kalimat] = stemmer_func(kalimat, kamus_dasar)
+    return [hasil[kalimat] for kalimat in kalimat_list]
+
+
+def stem_cache_info():
+    """Statistik memo per kata (hits, misses, maxsize, currsize)."""
+    return _stem_kata_memo.cache_info()
+
+
+def clear_stem_cache():
+    """Kosongkan memo per kata."""
+    _stem_kata_memo.cache_clear()
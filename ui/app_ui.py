@@ -1,12 +1,9 @@
 import streamlit as st
 import os
-import json
 import html
 import tempfile
-from pathlib import Path
-from groq import Groq
-from fpdf import FPDF
-from core.parse_tree_generator import create_parse_tree
+
+from grammar import load_lexicon_index
 
 # ============================================================
 # EXPLANATIONS (Legenda Grammar)
@@ -46,14 +43,10 @@ EXPLANATIONS = {
 # ============================================================
 # Helper: Load Lexicon
 # ============================================================
-@st.cache_data
 def load_lexicon_data():
-    json_path = Path(__file__).parent.parent / "scraping" / "balinese_lexicon.json"
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    # View read-only {kategori: {kata: arti}} di atas leksikon biner bersama
+    # (mmap, satu salinan per mesin) — tidak mem-parse JSON lagi
+    return load_lexicon_index().data
 
 def _get_lexicon() -> dict:
     return st.session_state.get("lexicon_data", {})
@@ -82,6 +75,7 @@ def get_ai_chat_response(user_message, chat_history, words, parse_table, is_vali
     if not groq_key:
         return "⚠️ API Key Groq tidak ditemukan."
 
+    from groq import Groq
     client = Groq(api_key=groq_key)
     n = len(words)
 
@@ -137,6 +131,7 @@ def get_ai_explanation_text(words, parse_table, is_valid, lexicon_data):
     if not groq_key:
         return "⚠️ API Key Groq tidak ditemukan."
 
+    from groq import Groq
     client = Groq(api_key=groq_key)
     n = len(words)
 
@@ -333,7 +328,10 @@ def render_parse_table(words, parse_table, dark_mode=False, is_valid=None):
             unsafe_allow_html=True
         )
 
-def render_analysis_results(words, table, is_valid, cnf_grammar, sentence_str, backpointers):
+# Nomor tree terbesar yang bisa dipilih di st.number_input
+MAX_TREE_NO = 2**53 - 1
+
+def render_analysis_results(words, table, is_valid, cnf_grammar, sentence_str, backpointers, forest=None):
     if is_valid:
         st.success(f"✅ Kalimat VALID: **{sentence_str}**")
     else:
@@ -348,7 +346,23 @@ def render_analysis_results(words, table, is_valid, cnf_grammar, sentence_str, b
     with col_tree:
         st.markdown("### 🌳 Visualisasi Tree")
         if is_valid:
+            # Kalimat ambigu: pilih tree ke-N dari parse forest (tree lain tidak dibangun)
+            total_parses = forest.count() if forest is not None else 1
+            if total_parses > 1:
+                st.caption(f"🔀 Kalimat ambigu: **{total_parses:,} parse tree** berbeda")
+                # Widget angka Streamlit dibatasi 2^53 - 1 (batas integer JavaScript)
+                max_tree_no = min(total_parses, MAX_TREE_NO)
+                if max_tree_no < total_parses:
+                    st.caption(f"Hanya tree ke-1 sampai ke-{max_tree_no:,} yang bisa dipilih.")
+                tree_no = st.number_input(
+                    "Tampilkan tree ke-", min_value=1, max_value=max_tree_no, value=1,
+                    key=f"tree_no_{sentence_str.replace(' ', '_')}"
+                )
+                if tree_no > 1:
+                    backpointers = forest.tree_at(tree_no - 1)
             try:
+                # networkx + matplotlib hanya di-load saat tree pertama digambar
+                from core.parse_tree_generator import create_parse_tree
                 img_buf = create_parse_tree(words, table, cnf_grammar, backpointers)
                 st.markdown('<div class="custom-card">', unsafe_allow_html=True)
                 st.image(img_buf, use_container_width=True)
@@ -578,6 +592,7 @@ def render_grammar_expanders(rules_cfg, dark_mode=False):
         st.markdown('</div>', unsafe_allow_html=True)
 
 def generate_pdf_report(sentence, is_valid, explanation, include_table, include_tree, words, table, img_buf=None):
+    from fpdf import FPDF
     pdf = FPDF()
     pdf.add_page()
 
@@ -1,2 +1,16 @@
-from .stats_manager import load_stats, update_stats, render_stats_dashboard
-from .batch_processor import process_files
\ No newline at end of file
+from importlib import import_module
+
+# Re-export secara lazy: `from utils import batch_processor` (CLI) tidak boleh
+# ikut meng-import Streamlit/plotly lewat stats_manager.
+_EXPORTS = {
+    "load_stats": "stats_manager",
+    "update_stats": "stats_manager",
+    "render_stats_dashboard": "stats_manager",
+    "process_files": "batch_processor",
+}
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
@@ -0,0 +1,287 @@
+"""
+Job batch di latar belakang (tanpa Streamlit).
+
+- submit_job menyalin file upload ke JOBS_DIR/<id>/ (.cache/jobs) lalu memproses di thread
+  terpisah lewat stream_process_files, jadi script Streamlit tidak terblokir dan
+  job tetap jalan walau browser terputus / script di-rerun
+- Setelah tiap chunk tertulis ke hasil.csv, posisi terakhir (file ke-berapa, baris
+  ke-berapa, ukuran output, jumlah VALID/INVALID) disimpan ke job.json (checkpoint)
+- Job yang terhenti (server restart, pause_job) dilanjutkan dari checkpoint terakhir
+  oleh resume_jobs / resume_job; baris yang sudah selesai tidak di-parse ulang
+- UI cukup polling job_status / list_jobs (membaca job.json)
+
+Satu job hanya dijalankan oleh satu proses: runner memegang lock file (runner.lock,
+fcntl.flock) selama berjalan, jadi proses lain (mis. script / benchmark yang
+meng-import app) tidak bisa ikut menulis ke hasil.csv yang sama. Di sistem tanpa
+fcntl (Windows) hanya pengecekan thread di proses ini yang berlaku.
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from grammar.compiled_cache import get_cache_dir
+from utils.batch_processor import STOPPED_MESSAGE, STREAM_CHUNK_ROWS, stream_process_files
+
+# Di dalam .cache proyek (git-ignored), bukan tergantung direktori kerja
+JOBS_DIR = os.path.join(get_cache_dir(), "jobs")
+JOB_FILE = "job.json"
+RESULT_FILE = "hasil.csv"
+LOCK_FILE = "runner.lock"
+
+# Status yang berarti job belum selesai dan boleh dilanjutkan
+UNFINISHED = ("queued", "running", "paused")
+
+_threads = {}
+_stop_events = {}
+_lock = threading.Lock()
+
+
+def _job_dir(job_id):
+    return os.path.join(JOBS_DIR, job_id)
+
+
+def _read_job(job_id):
+    with open(os.path.join(_job_dir(job_id), JOB_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_job(job):
+    """Tulis ke file sementara lalu rename, supaya job.json tidak pernah setengah jadi."""
+    path = os.path.join(_job_dir(job["id"]), JOB_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _update_job(job_id, **fields):
+    with _lock:
+        job = _read_job(job_id)
+        job.update(fields, updated=time.time())
+        _write_job(job)
+        return job
+
+
+def _try_lock(job_id):
+    """Ambil lock runner job tanpa menunggu → file lock, atau None kalau dipegang proses lain."""
+    lock = open(os.path.join(_job_dir(job_id), LOCK_FILE), "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return None
+    return lock
+
+
+def _input_paths(job):
+    # Tiap file di subfolder sendiri supaya nama aslinya (kolom 'sumber') tetap sama
+    return [os.path.join(_job_dir(job["id"]), "input", str(i), name) for i, name in enumerate(job["files"])]
+
+
+def submit_job(files, kamus_dasar, stemmer_func, workers=1, chunksize=STREAM_CHUNK_ROWS):
+    """
+    Simpan file (upload ber-atribut .name / path) sebagai job baru dan mulai memprosesnya.
+    Returns: job_id
+    """
+    job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    names = [os.path.basename(str(getattr(f, "name", f))) for f in files]
+    job = {
+        "id": job_id,
+        "files": names,
+        "status": "queued",
+        "created": time.time(),
+        "updated": time.time(),
+        "workers": workers,
+        "chunksize": chunksize,
+        "counts": {"total": 0, "valid": 0, "invalid": 0},
+        "checkpoint": None,
+        "warnings": [],
+        "error": None,
+    }
+    os.makedirs(_job_dir(job_id))
+    for path, f in zip(_input_paths(job), files):
+        os.makedirs(os.path.dirname(path))
+        if isinstance(f, (str, os.PathLike)):
+            shutil.copyfile(f, path)
+        else:
+            f.seek(0)
+            with open(path, "wb") as out:
+                shutil.copyfileobj(f, out)
+    _write_job(job)
+
+    _start(job_id, kamus_dasar, stemmer_func)
+    return job_id
+
+
+def _start(job_id, kamus_dasar, stemmer_func):
+    with _lock:
+        thread = _threads.get(job_id)
+        if thread is not None and thread.is_alive():
+            return False
+        # Job sedang dijalankan proses lain → jangan ikut memotong / menambah hasil.csv
+        runner_lock = _try_lock(job_id)
+        if runner_lock is None:
+            return False
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=_run, args=(job_id, kamus_dasar, stemmer_func, stop_event, runner_lock),
+            name=f"batch-job-{job_id}", daemon=True,
+        )
+        _threads[job_id] = thread
+        _stop_events[job_id] = stop_event
+    thread.start()
+    return True
+
+
+def _run(job_id, kamus_dasar, stemmer_func, stop_event, runner_lock):
+    # Lock dilepas saat thread selesai (apa pun hasilnya); proses mati → dilepas OS
+    with runner_lock:
+        _run_locked(job_id, kamus_dasar, stemmer_func, stop_event)
+
+
+def _run_locked(job_id, kamus_dasar, stemmer_func, stop_event):
+    job = _update_job(job_id, status="running", error=None)
+    messages = list(job["warnings"])
+
+    def warn(message):
+        messages.append(message)
+        _update_job(job_id, warnings=messages)
+
+    def checkpoint(state):
+        _update_job(job_id, checkpoint=state, counts=state["counts"])
+
+    try:
+        counts, err = stream_process_files(
+            _input_paths(job),
+            os.path.join(_job_dir(job_id), RESULT_FILE),
+            kamus_dasar,
+            stemmer_func,
+            workers=job["workers"],
+            chunksize=job["chunksize"],
+            warn=warn,
+            resume=job["checkpoint"],
+            on_checkpoint=checkpoint,
+            stop_event=stop_event,
+        )
+    except Exception as e:
+        sys.stderr.write(f"WARNING: Batch job {job_id} failed: {e}\n")
+        _update_job(job_id, status="failed", error=str(e))
+        return
+
+    # Dari hasil stream_process_files, bukan stop_event: jeda yang diklik saat chunk
+    # terakhir ditulis tidak membuat job yang sudah lengkap tercatat 'paused'
+    if err == STOPPED_MESSAGE:
+        _update_job(job_id, status="paused")
+    elif err:
+        _update_job(job_id, status="failed", error=err, counts=counts)
+    else:
+        _update_job(job_id, status="done", counts=counts)
+
+
+def pause_job(job_id):
+    """Minta job berhenti setelah chunk yang sedang berjalan; lanjutkan lagi dengan resume_job."""
+    with _lock:
+        stop_event = _stop_events.get(job_id)
+    if stop_event is not None:
+        stop_event.set()
+
+
+def resume_job(job_id, kamus_dasar, stemmer_func):
+    """Lanjutkan satu job yang belum selesai dari checkpoint terakhirnya (False kalau sedang jalan / sudah selesai)."""
+    if job_status(job_id)["status"] not in UNFINISHED:
+        return False
+    return _start(job_id, kamus_dasar, stemmer_func)
+
+
+def resume_jobs(kamus_dasar, stemmer_func):
+    """
+    Lanjutkan job yang terputus (status queued/running tapi tidak ada thread-nya,
+    mis. setelah server restart). Job yang di-pause user dibiarkan.
+    Returns: list job_id yang dilanjutkan
+    """
+    resumed = []
+    for job in list_jobs():
+        if job["status"] in ("queued", "running") and _start(job["id"], kamus_dasar, stemmer_func):
+            resumed.append(job["id"])
+    return resumed
+
+
+def is_running(job_id):
+    """True kalau job sedang berjalan, di proses ini atau (lewat runner.lock) di proses lain."""
+    with _lock:
+        thread = _threads.get(job_id)
+    if thread is not None and thread.is_alive():
+        return True
+    if not os.path.isdir(_job_dir(job_id)):
+        return False
+    runner_lock = _try_lock(job_id)
+    if runner_lock is None:
+        return True
+    runner_lock.close()
+    return False
+
+
+def job_status(job_id):
+    """Isi job.json: status, files, counts (baris selesai), checkpoint, warnings, error."""
+    with _lock:
+        return _read_job(job_id)
+
+
+def list_jobs():
+    """Semua job di JOBS_DIR, terbaru dulu."""
+    if not os.path.isdir(JOBS_DIR):
+        return []
+    jobs = []
+    for job_id in os.listdir(JOBS_DIR):
+        try:
+            jobs.append(job_status(job_id))
+        except (OSError, ValueError):
+            continue
+    return sorted(jobs, key=lambda job: job["created"], reverse=True)
+
+
+def job_result_path(job_id):
+    return os.path.join(_job_dir(job_id), RESULT_FILE)
+
+
+def load_job_result(job_id):
+    """Hasil job (sampai checkpoint terakhir) sebagai DataFrame; None kalau belum ada baris."""
+    job = job_status(job_id)
+    checkpoint = job["checkpoint"]
+    if not checkpoint:
+        return None
+    # Baca hanya sampai checkpoint: byte setelahnya milik chunk yang belum selesai
+    with open(job_result_path(job_id), "rb") as f:
+        data = f.read(checkpoint["output_size"])
+    return pd.read_csv(io.BytesIO(data), keep_default_na=False)
+
+
+def delete_job(job_id):
+    """Hapus job yang tidak sedang berjalan beserta file input & hasilnya."""
+    if is_running(job_id):
+        return False
+    with _lock:
+        _threads.pop(job_id, None)
+        _stop_events.pop(job_id, None)
+    shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+    return True
@@ -1,19 +1,84 @@
 import io
+import os
 import re
-import unicodedata
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import chain
+import numpy as np
 import pandas as pd
-import streamlit as st
 
-from core import cyk_algorithm, convert_to_cnf, remove_epsilon_productions, remove_unit_productions
-from grammar import RULES_CFG
-from utils import stats_manager
-from docx import Document
+from core import LRUCache
+from core.cyk_numpy import cyk_recognize_numpy_batch
+from grammar import grammar_fingerprint, load_compiled_grammar
+from grammar.stemmer import normalisasi_kolom, stem_kalimat_batch
 
+# Jumlah kalimat per panggilan recognizer vektor (progress di-update per chunk)
+RECOGNIZE_CHUNK_SIZE = 256
 
-def read_to_dataframe(uploaded_file) -> tuple[pd.DataFrame | None, str | None]:
+# Jeda minimum (detik) antar update progress bar di UI
+PROGRESS_INTERVAL = 0.2
+
+# Di bawah jumlah ini, overhead start worker lebih mahal dari parsing-nya
+PARALLEL_MIN_SENTENCES = 2000
+
+# Verdict per kalimat (hasil stem), bertahan antar upload dalam satu proses server.
+# Key diawali fingerprint grammar+leksikon. Grammar & leksikon dimuat sekali per proses,
+# jadi perubahan rules / balinese_lexicon.json baru berlaku setelah server di-restart.
+VERDICT_CACHE_SIZE = 200_000
+_verdict_cache = LRUCache(maxsize=VERDICT_CACHE_SIZE)
+
+# Grammar milik proses worker, dikirim sekali lewat initializer
+_worker_grammar = None
+
+
+def _streamlit():
+    # Streamlit hanya dibutuhkan jalur UI; CLI / streaming tidak meng-import-nya
+    import streamlit as st
+    return st
+
+
+def _init_worker(grammar):
+    global _worker_grammar
+    _worker_grammar = grammar
+
+
+def _recognize_chunk(sentences):
+    return cyk_recognize_numpy_batch(_worker_grammar, sentences)
+
+
+def recognize_sentences(grammar, sentences, executor=None, on_progress=None):
+    """
+    Validasi daftar kalimat (list kata) per chunk → list bool, urutan sama dengan input.
+    - executor: ProcessPoolExecutor yang worker-nya sudah diinisialisasi dengan grammar
+      (lihat _init_worker); None = jalan di proses ini
+    - on_progress(done, total): dipanggil setiap satu chunk selesai
+    """
+    total = len(sentences)
+    chunks = [
+        sentences[start:start + RECOGNIZE_CHUNK_SIZE]
+        for start in range(0, total, RECOGNIZE_CHUNK_SIZE)
+    ]
+
+    if executor is None or total < PARALLEL_MIN_SENTENCES:
+        verdict_chunks = (cyk_recognize_numpy_batch(grammar, chunk) for chunk in chunks)
+    else:
+        # map() mengembalikan hasil sesuai urutan chunk
+        verdict_chunks = executor.map(_recognize_chunk, chunks)
+
+    results = []
+    for verdicts in verdict_chunks:
+        results.extend(verdicts)
+        if on_progress:
+            on_progress(len(results), total)
+    return results
+
+
+def read_to_dataframe(uploaded_file, warn=None) -> tuple[pd.DataFrame | None, str | None]:
     """
     Baca berbagai format file → DataFrame dengan kolom 'kalimat'.
     Format yang didukung: CSV, Excel (.xlsx/.xls), Word (.docx), Plain Text (.txt)
+    - warn(pesan): lihat _normalize_columns
     Returns: (df, error_message)
     """
     name = uploaded_file.name.lower()
@@ -33,6 +98,7 @@ def read_to_dataframe(uploaded_file) -> tuple[pd.DataFrame | None, str | None]:
 
         # Word (.docx)
         elif name.endswith('.docx'):
+            from docx import Document
             doc = Document(io.BytesIO(uploaded_file.read()))
 
             # Prioritas 1: tabel yang punya header 'kalimat'
@@ -45,7 +111,7 @@ def read_to_dataframe(uploaded_file) -> tuple[pd.DataFrame | None, str | None]:
                     ]
                     df = pd.DataFrame(rows)
                     df = df[df['kalimat'].str.strip().ne('')]
-                    return _normalize_columns(df, uploaded_file.name), None
+                    return _normalize_columns(df, uploaded_file.name, warn), None
 
             # Prioritas 2: paragraf & list (bullet/numbered)
             kalimat_list = []
@@ -82,18 +148,19 @@ def read_to_dataframe(uploaded_file) -> tuple[pd.DataFrame | None, str | None]:
         return None, f"Gagal membaca '{uploaded_file.name}': {str(e)}"
 
     df.columns = df.columns.str.strip()
-    return _normalize_columns(df, uploaded_file.name), None
+    return _normalize_columns(df, uploaded_file.name, warn), None
 
 
-def _normalize_columns(df: pd.DataFrame, filename: str) -> pd.DataFrame:
+def _normalize_columns(df: pd.DataFrame, filename: str, warn=None) -> pd.DataFrame:
     """
     Pastikan kolom 'kalimat' ada.
     Kalau tidak ada, gunakan kolom pertama sebagai fallback + warning.
+    - warn(pesan): tempat warning dikirim; None = st.warning
     """
     if 'kalimat' not in df.columns:
         first_col = df.columns[0]
         df = df.rename(columns={first_col: 'kalimat'})
-        st.warning(
+        (warn or _streamlit().warning)(
             f"⚠️ Kolom 'kalimat' tidak ditemukan di **{filename}**. "
             f"Menggunakan kolom pertama: **'{first_col}'**"
         )
@@ -103,100 +170,519 @@ def _normalize_columns(df: pd.DataFrame, filename: str) -> pd.DataFrame:
 def process_files(
     uploaded_files,
     kamus_dasar,
-    stemmer_func
+    stemmer_func,
+    workers: int = 1
 ) -> tuple[pd.DataFrame | None, str | None]:
     """
     Proses satu atau beberapa file sekaligus.
     - Semua kolom original dipertahankan
     - Tambah kolom 'sumber' (nama file) di awal
-    - Tambah kolom 'status' (VALID/INVALID) di akhir
+    - Tambah kolom 'status' (VALID/INVALID) + 'oov_tokens' (kata di luar leksikon) di akhir
+    - workers > 1: validasi dibagi per chunk ke ProcessPoolExecutor
     Returns: (df_gabungan, error_message)
     """
-    # Siapkan grammar sekali untuk semua file
-    cfg_cleaned = remove_epsilon_productions(RULES_CFG)
-    cfg_cleaned = remove_unit_productions(cfg_cleaned)
-    cnf_grammar = convert_to_cnf(cfg_cleaned)
+    # Grammar CNF dari cache disk; normalisasi hanya jalan kalau grammar berubah
+    cnf_grammar = load_compiled_grammar()
 
     all_dfs = []
 
-    for uploaded_file in uploaded_files:
-        st.caption(f"⏳ Membaca **{uploaded_file.name}**...")
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cnf_grammar,))
+        if workers > 1 else nullcontext()
+    )
+    with pool as executor:
+        for uploaded_file in uploaded_files:
+            df = _process_one_file(uploaded_file, cnf_grammar, kamus_dasar, stemmer_func, executor)
+            if df is None:
+                continue
+
+            # Kolom: sumber | kolom original | status | oov_tokens
+            if len(uploaded_files) > 1:
+                df.insert(0, 'sumber', uploaded_file.name)
 
-        df, err = read_to_dataframe(uploaded_file)
-        if err:
-            st.error(f"❌ {uploaded_file.name}: {err}")
-            continue
+            all_dfs.append(df)
+
+    if not all_dfs:
+        return None, "Tidak ada file yang berhasil diproses."
 
-        total = len(df)
-        if total == 0:
-            st.warning(f"⚠️ **{uploaded_file.name}** tidak memiliki data, dilewati.")
-            continue
+    return pd.concat(all_dfs, ignore_index=True), None
 
-        st.caption(f"✅ **{uploaded_file.name}** — {total} baris ditemukan")
 
-        results = []
-        progress_bar = st.progress(0, text=f"Memproses {uploaded_file.name}...")
+def verdict_cache_stats() -> dict:
+    """Ukuran + hit/miss _verdict_cache (untuk halaman statistik)."""
+    return _verdict_cache.stats()
 
-        for i, row in df.iterrows():
-            sentence_raw = str(row['kalimat']).lower().strip()
-            sentence_normalized = (
-                unicodedata.normalize('NFKD', sentence_raw)
-                .encode('ASCII', 'ignore')
-                .decode('utf-8')
-            )
-            sentence_final, _ = stemmer_func(sentence_normalized, kamus_dasar)
-            words = sentence_final.split()
 
-            if not words:
-                results.append("INVALID")
-            else:
-                is_valid, _, _ = cyk_algorithm(cnf_grammar, words)
-                results.append("VALID" if is_valid else "INVALID")
+def cached_verdicts(grammar, sentences, executor=None, on_progress=None) -> dict:
+    """
+    Verdict untuk kalimat-kalimat unik (string hasil stem) → {kalimat: bool}.
+    Yang sudah ada di _verdict_cache tidak di-parse ulang; sisanya lewat recognize_sentences.
+    """
+    fingerprint = grammar_fingerprint()
+    verdicts = {}
+    missing = []
+    for sentence in sentences:
+        is_valid = _verdict_cache.get((fingerprint, sentence))
+        if is_valid is None:
+            missing.append(sentence)
+        else:
+            verdicts[sentence] = is_valid
 
-            progress_bar.progress((i + 1) / total, text=f"Memproses {uploaded_file.name}...")
+    parsed = recognize_sentences(
+        grammar, [sentence.split() for sentence in missing], executor, on_progress
+    )
+    for sentence, is_valid in zip(missing, parsed):
+        verdicts[sentence] = is_valid
+        _verdict_cache.put((fingerprint, sentence), is_valid)
 
-        # Kolom: sumber | kolom original | status
-        if len(uploaded_files) > 1:
-            df.insert(0, 'sumber', uploaded_file.name)
-        df['status'] = results
+    return verdicts
 
-        all_dfs.append(df)
 
-    if not all_dfs:
-        return None, "Tidak ada file yang berhasil diproses."
+def _stem_keys(sentences, kamus_dasar, stemmer_func) -> np.ndarray:
+    """
+    Kolom kalimat mentah → array kalimat hasil normalisasi + stem (key verdict), urutan sama.
+    Normalisasi jalan sekali untuk seluruh kolom kalimat unik (normalisasi_kolom),
+    lalu stem lewat stem_kalimat_batch; hasil per kalimat unik disebar balik lewat kode factorize.
+    Sel kosong (NaN / None) dijadikan '' sebelum str(x): tetap INVALID (kalimat tanpa kata),
+    tapi tanpa kata 'nan' palsu di oov_tokens.
+    """
+    sentences = sentences.astype(object).where(sentences.notna(), '')
+    codes, unique = pd.factorize(sentences.map(str), use_na_sentinel=False)
+    hasil = stem_kalimat_batch(normalisasi_kolom(unique.tolist()), kamus_dasar, stemmer_func)
+    return np.array([kalimat for kalimat, _ in hasil], dtype=object)[codes]
 
-    return pd.concat(all_dfs, ignore_index=True), None
+
+def _verdict_columns(keys, cnf_grammar, executor, on_progress=None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Kolom hasil untuk array kalimat hasil stem → (status, oov_tokens), sebagai array.
+    Kalimat dengan kata di luar leksikon (tanpa aturan leksikal di grammar) langsung
+    INVALID tanpa CYK; kata-kata itu dicatat di oov_tokens (dipisah koma, '' kalau tidak ada).
+    """
+    # Tanpa sentinel: nilai hilang jadi kategori sendiri, bukan kode -1 yang
+    # diam-diam mengambil hasil kalimat unik terakhir
+    codes, unique = pd.factorize(keys, use_na_sentinel=False)
+    unique = [str(key) for key in unique]
+    oov = [cnf_grammar.unknown_words(key.split()) for key in unique]
+    verdicts = cached_verdicts(
+        cnf_grammar, [key for key, unknown in zip(unique, oov) if not unknown], executor, on_progress
+    )
+    valid = np.array([verdicts.get(key, False) for key in unique], dtype=bool)
+    statuses = np.where(valid, "VALID", "INVALID").astype(object)
+    oov_tokens = np.array([", ".join(unknown) for unknown in oov], dtype=object)
+    return statuses[codes], oov_tokens[codes]
+
+
+def _throttled(callback, interval=PROGRESS_INTERVAL):
+    """
+    Bungkus on_progress(done, total) supaya dipanggil paling sering sekali per `interval` detik
+    (tiap update progress bar = satu pesan websocket); update terakhir (done == total) selalu lewat.
+    """
+    last = [float('-inf')]
+
+    def report(done, total):
+        now = time.monotonic()
+        if done >= total or now - last[0] >= interval:
+            last[0] = now
+            callback(done, total)
+
+    return report
+
+
+def _process_one_file(uploaded_file, cnf_grammar, kamus_dasar, stemmer_func, executor):
+    """Baca, stem, dan validasi satu file → df dengan kolom 'status' + 'oov_tokens', atau None kalau gagal."""
+    st = _streamlit()
+    st.caption(f"⏳ Membaca **{uploaded_file.name}**...")
+
+    df, err = read_to_dataframe(uploaded_file)
+    if err:
+        st.error(f"❌ {uploaded_file.name}: {err}")
+        return None
+
+    total = len(df)
+    if total == 0:
+        st.warning(f"⚠️ **{uploaded_file.name}** tidak memiliki data, dilewati.")
+        return None
+
+    st.caption(f"✅ **{uploaded_file.name}** — {total} baris ditemukan")
+
+    keys = _stem_keys(df['kalimat'], kamus_dasar, stemmer_func)
+
+    # Batch cukup butuh VALID/INVALID → recognizer vektor tanpa backpointer,
+    # dan tiap kalimat unik cukup di-parse sekali
+    progress_bar = st.progress(0, text=f"Memproses {uploaded_file.name}...")
+    df['status'], df['oov_tokens'] = _verdict_columns(
+        keys, cnf_grammar, executor,
+        on_progress=_throttled(lambda done, total: progress_bar.progress(
+            done / total, text=f"Memproses {uploaded_file.name}..."
+        ))
+    )
+    progress_bar.progress(1.0, text=f"Selesai {uploaded_file.name}")
+    return df
+
+
+# ─── Streaming (file besar) ────────────────────────────────────────────────
+# Baris per chunk saat streaming; memori dibatasi oleh chunk ini + verdict cache
+STREAM_CHUNK_ROWS = 5000
+
+# Pesan error stream_process_files kalau stop_event menghentikannya sebelum semua baris selesai
+STOPPED_MESSAGE = "Dihentikan sebelum selesai."
+
+
+@contextmanager
+def _open_binary(source):
+    """Path → dibuka (dan ditutup) di sini; file-like (upload) → dipakai dari awal, tidak ditutup."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield f
+    else:
+        source.seek(0)
+        yield source
+
+
+def _source_name(source) -> str:
+    return os.path.basename(str(getattr(source, 'name', source)))
+
+
+def _sniff_csv_sep(f) -> str:
+    sample = f.read(2048).decode('utf-8', errors='ignore')
+    f.seek(0)
+    return '\t' if sample.count('\t') > sample.count(',') else ','
+
+
+def _iter_txt_rows(f, chunksize):
+    text = io.TextIOWrapper(f, encoding='utf-8', errors='ignore')
+    try:
+        lines = []
+        for line in text:
+            line = line.strip()
+            if line:
+                lines.append(line)
+            if len(lines) == chunksize:
+                yield pd.DataFrame({'kalimat': lines})
+                lines = []
+        if lines:
+            yield pd.DataFrame({'kalimat': lines})
+    finally:
+        # Lepas wrapper tanpa menutup file di bawahnya
+        text.detach()
+
+
+def _iter_xlsx_rows(f, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(f, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(col).strip() if col is not None else f"Unnamed: {i}"
+            for i, col in enumerate(header)
+        ]
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row[:len(columns)])
+            if len(buffer) == chunksize:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(source, chunksize: int = STREAM_CHUNK_ROWS, warn=None):
+    """
+    Baca file per chunk → generator DataFrame (kolom 'kalimat' dijamin ada).
+    - source: path atau file-like ber-atribut .name (mis. upload Streamlit)
+    - CSV / TXT / XLSX dibaca bertahap, memori tidak tergantung ukuran file
+    - XLS / DOCX tidak punya reader bertahap → dibaca utuh lalu dipotong per chunk
+    Format tidak didukung / file rusak → ValueError berisi pesan untuk user.
+    """
+    name = _source_name(source)
+    lower = name.lower()
+
+    with _open_binary(source) as f:
+        if lower.endswith('.csv'):
+            chunks = pd.read_csv(f, sep=_sniff_csv_sep(f), chunksize=chunksize)
+        elif lower.endswith('.txt'):
+            chunks = _iter_txt_rows(f, chunksize)
+        elif lower.endswith('.xlsx'):
+            chunks = _iter_xlsx_rows(f, chunksize)
+        else:
+            whole = io.BytesIO(f.read())
+            whole.name = name
+            df, err = read_to_dataframe(whole, warn)
+            if err:
+                raise ValueError(err)
+            chunks = (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+
+        columns = None
+        try:
+            for chunk in chunks:
+                if columns is None:
+                    chunk.columns = chunk.columns.astype(str).str.strip()
+                    chunk = _normalize_columns(chunk, name, warn)
+                    columns = chunk.columns
+                else:
+                    chunk.columns = columns
+                yield chunk
+        finally:
+            # Berhenti di tengah jalan → tutup reader selagi file masih terbuka
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+
+def stream_process_files(
+    sources,
+    output_path,
+    kamus_dasar,
+    stemmer_func,
+    workers: int = 1,
+    chunksize: int = STREAM_CHUNK_ROWS,
+    on_progress=None,
+    warn=None,
+    resume=None,
+    on_checkpoint=None,
+    stop_event=None,
+) -> tuple[dict, str | None]:
+    """
+    Versi streaming dari process_files untuk korpus besar.
+    Tiap chunk dibaca, di-stem, divalidasi, lalu langsung ditambahkan ke CSV output,
+    jadi tidak ada DataFrame gabungan di memori.
+    - Kolom output: [sumber] | kolom original | status | oov_tokens (kolom diambil dari chunk pertama;
+      file berikutnya dengan kolom berbeda diselaraskan ke kolom itu + warning)
+    - on_progress(baris_selesai, nama_file): dipanggil setiap chunk selesai
+    - warn(pesan): warning untuk user; None = st.warning
+    - on_checkpoint(state): dipanggil setelah chunk tertulis (dan di-fsync) ke output;
+      state = {'source', 'rows', 'counts', 'columns', 'output_size'} cukup untuk melanjutkan
+    - resume: state dari on_checkpoint terakhir → output dipotong ke output_size, file
+      sebelum 'source' dilewati, dan 'rows' baris pertama file 'source' tidak diproses ulang
+    - stop_event: threading.Event; kalau di-set, berhenti sebelum chunk berikutnya
+      (hasil sampai checkpoint terakhir tetap utuh); error_message = STOPPED_MESSAGE
+      hanya kalau masih ada baris yang belum diproses
+    Returns: ({'total', 'valid', 'invalid'}, error_message)
+    """
+    warn = warn or _streamlit().warning
+    cnf_grammar = load_compiled_grammar()
+    if resume:
+        state = {**resume, 'counts': dict(resume['counts'])}
+        # Buang sisa tulisan setelah checkpoint terakhir (chunk yang belum selesai)
+        with open(output_path, 'r+b') as f:
+            f.truncate(state['output_size'])
+    else:
+        state = {
+            'source': 0, 'rows': 0, 'columns': None, 'output_size': 0,
+            'counts': {'total': 0, 'valid': 0, 'invalid': 0},
+        }
+    counts = state['counts']
+    stopped = False
+
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cnf_grammar,))
+        if workers > 1 else nullcontext()
+    )
+    with pool as executor, open(output_path, 'a' if resume else 'w', encoding='utf-8', newline='') as out:
+        for source_index, source in enumerate(sources):
+            if source_index < state['source'] or stopped:
+                continue
+            name = _source_name(source)
+            skip = state['rows'] if source_index == state['source'] else 0
+            rows_read = 0
+            warned_columns = False
+            try:
+                for chunk in iter_chunks(source, chunksize, warn):
+                    if stop_event is not None and stop_event.is_set():
+                        stopped = True
+                        break
+                    # Baris yang sudah tercatat di checkpoint tidak diproses ulang
+                    start = rows_read
+                    rows_read += len(chunk)
+                    if rows_read <= skip:
+                        continue
+                    if start < skip:
+                        chunk = chunk.iloc[skip - start:]
+                    if chunk.empty:
+                        continue
+                    chunk = chunk.reset_index(drop=True)
+                    chunk['status'], chunk['oov_tokens'] = _chunk_statuses(
+                        chunk['kalimat'], cnf_grammar, kamus_dasar, stemmer_func, executor
+                    )
+                    if len(sources) > 1:
+                        chunk.insert(0, 'sumber', name)
+
+                    columns = state['columns']
+                    if columns is None:
+                        state['columns'] = list(chunk.columns)
+                    elif list(chunk.columns) != columns:
+                        if set(chunk.columns) != set(columns) and not warned_columns:
+                            warned_columns = True
+                            warn(
+                                f"⚠️ Kolom **{name}** berbeda dengan file pertama; "
+                                f"diselaraskan ke: {', '.join(columns)}"
+                            )
+                        chunk = chunk.reindex(columns=columns)
+
+                    chunk.to_csv(out, header=counts['total'] == 0, index=False)
+
+                    valid = int((chunk['status'] == "VALID").sum())
+                    counts['total'] += len(chunk)
+                    counts['valid'] += valid
+                    counts['invalid'] += len(chunk) - valid
+                    if on_checkpoint:
+                        out.flush()
+                        os.fsync(out.fileno())
+                        state.update(
+                            source=source_index, rows=rows_read, output_size=os.fstat(out.fileno()).st_size
+                        )
+                        on_checkpoint({**state, 'counts': dict(counts)})
+                    if on_progress:
+                        on_progress(counts['total'], name)
+            except Exception as e:
+                warn(f"❌ {name}: {e}")
+
+    if stopped:
+        return counts, STOPPED_MESSAGE
+    if counts['total'] == 0:
+        return counts, "Tidak ada file yang berhasil diproses."
+    return counts, None
+
+
+def _chunk_statuses(sentences, cnf_grammar, kamus_dasar, stemmer_func, executor) -> tuple[np.ndarray, np.ndarray]:
+    """Stem + validasi satu chunk kalimat mentah → (array status VALID/INVALID, array oov_tokens)."""
+    keys = _stem_keys(sentences, kamus_dasar, stemmer_func)
+    return _verdict_columns(keys, cnf_grammar, executor)
+
+
+# ─── Export ────────────────────────────────────────────────────────────────
+EXCEL_SHEET = "Hasil Validasi"
+
+# Baris awal yang diukur untuk menaksir lebar kolom Excel
+EXCEL_WIDTH_SAMPLE = 1000
+
+
+def _excel_rows(frame: pd.DataFrame):
+    # NaN → sel kosong, seperti DataFrame.to_excel
+    values = frame.astype(object)
+    return values.where(frame.notna(), None).itertuples(index=False, name=None)
+
+
+def write_excel(chunks, target):
+    """
+    Tulis hasil batch ke .xlsx secara streaming (openpyxl write-only).
+    - chunks: DataFrame, atau iterable DataFrame berkolom sama
+      (mis. pd.read_csv(..., chunksize=...)) → file besar tidak perlu dimuat utuh
+    - target: path atau file-like
+    Baris langsung ditulis ke XML tanpa objek sel. Lebar kolom ditaksir dari
+    EXCEL_WIDTH_SAMPLE baris pertama, warna VALID/INVALID memakai conditional
+    formatting pada kolom status (bukan style per sel).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.styles import PatternFill, Font
+    from openpyxl.utils import get_column_letter
+
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        first = pd.DataFrame()
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(EXCEL_SHEET)
+    headers = [str(col) for col in first.columns]
+
+    # Write-only: lebar kolom harus di-set sebelum baris pertama ditulis
+    sample = list(_excel_rows(first.head(EXCEL_WIDTH_SAMPLE)))
+    for col_idx, header in enumerate(headers):
+        max_len = max(
+            (len(str(row[col_idx])) for row in sample if row[col_idx] is not None),
+            default=0,
+        )
+        worksheet.column_dimensions[get_column_letter(col_idx + 1)].width = min(max(max_len, len(header)) + 4, 60)
+
+    header_font = Font(bold=True)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(worksheet, value=header)
+        cell.font = header_font
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+
+    n_rows = 0
+    for chunk in chain([first], chunks):
+        for row in _excel_rows(chunk):
+            worksheet.append(row)
+        n_rows += len(chunk)
+
+    if 'status' in headers and n_rows:
+        col = get_column_letter(headers.index('status') + 1)
+        cells = f"{col}2:{col}{n_rows + 1}"
+        worksheet.conditional_formatting.add(cells, CellIsRule(
+            operator='equal', formula=['"VALID"'],
+            fill=PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
+            font=Font(color="276221"),
+        ))
+        worksheet.conditional_formatting.add(cells, CellIsRule(
+            operator='equal', formula=['"INVALID"'],
+            fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
+            font=Font(color="9C0006"),
+        ))
+
+    workbook.save(target)
 
 
 def to_excel_bytes(df: pd.DataFrame) -> bytes:
     buffer = io.BytesIO()
+    write_excel(df, buffer)
+    return buffer.getvalue()
 
-    writer = pd.ExcelWriter(buffer, engine='openpyxl')
-    df.to_excel(writer, index=False, sheet_name="Hasil Validasi")
 
-    worksheet = writer.sheets["Hasil Validasi"]
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Alternatif cepat Excel: CSV UTF-8 tanpa index."""
+    return df.to_csv(index=False).encode('utf-8')
 
-    from openpyxl.styles import PatternFill, Font
-    green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    red_fill   = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    green_font = Font(color="276221")
-    red_font   = Font(color="9C0006")
-
-    headers = [cell.value for cell in worksheet[1]]
-    if 'status' in headers:
-        status_col = headers.index('status') + 1
-        for row in worksheet.iter_rows(min_row=2, min_col=status_col, max_col=status_col):
-            for cell in row:
-                if cell.value == "VALID":
-                    cell.fill = green_fill
-                    cell.font = green_font
-                elif cell.value == "INVALID":
-                    cell.fill = red_fill
-                    cell.font = red_font
-
-    for col in worksheet.columns:
-        max_len = max((len(str(cell.value or "")) for cell in col), default=0)
-        worksheet.column_dimensions[col[0].column_letter].width = min(max_len + 4, 60)
-
-    writer.close()
-    return buffer.getvalue()
\ No newline at end of file
+
+def write_parquet(chunks, target):
+    """
+    Tulis hasil batch ke .parquet per chunk (pyarrow ParquetWriter), tanpa memuat seluruh hasil.
+    - chunks: DataFrame, atau iterable DataFrame berkolom sama (mis. pd.read_csv(..., chunksize=...))
+    - target: path atau file-like
+    Semua kolom disimpan sebagai teks dengan satu skema tetap (diambil dari chunk pertama),
+    jadi tipe kolom tidak berubah-ubah antar chunk (mis. id angka di satu chunk, kosong di chunk lain).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        first = pd.DataFrame()
+
+    columns = [str(col) for col in first.columns]
+    schema = pa.schema([(col, pa.string()) for col in columns])
+    with pq.ParquetWriter(target, schema) as writer:
+        for chunk in chain([first], chunks):
+            chunk = chunk.set_axis(columns, axis=1)
+            text = chunk.astype(object).where(chunk.isna(), chunk.astype(str))
+            writer.write_table(pa.Table.from_pandas(text, schema=schema, preserve_index=False))
+
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Alternatif cepat & ringkas Excel: Parquet (pyarrow, sudah terpasang bersama Streamlit).
+    Kolom object campuran (mis. id angka & teks dari file berbeda) disimpan sebagai teks.
+    """
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
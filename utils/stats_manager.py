@@ -1,64 +1,25 @@
-import json
-import os
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
-STATS_FILE = "usage_stats.json"
+from utils.stats_store import get_store
 
 def load_stats():
-    if not os.path.exists(STATS_FILE):
-        return {"total_parsed": 0, "valid": 0, "invalid": 0, "history": []}
-    try:
-        with open(STATS_FILE, "r") as f:
-            return json.load(f)
-    except:
-        return {"total_parsed": 0, "valid": 0, "invalid": 0, "history": []}
+    # Agregat yang sudah dimaterialisasi di SQLite + 50 riwayat terakhir
+    return get_store().load()
 
 def update_stats(is_valid, sentence):
-    stats = load_stats()
-    stats["total_parsed"] += 1
-    if is_valid:
-        stats["valid"] += 1
-    else:
-        stats["invalid"] += 1
-    
-    # Simpan history singkat (max 50 terakhir)
-    stats["history"].append({"sentence": sentence, "valid": is_valid})
-    if len(stats["history"]) > 50:
-        stats["history"].pop(0)
-        
-    with open(STATS_FILE, "w") as f:
-        json.dump(stats, f)
+    # Hanya masuk buffer memori; ditulis ke disk per batch (lihat stats_store)
+    get_store().record([(sentence, is_valid)])
 
 def update_stats_batch(batch_results):
     if not batch_results:
         return
-        
-    stats = load_stats()
-    
-    # Hitung total
-    total_baru = len(batch_results)
-    valid_baru = sum(1 for item in batch_results if item["valid"])
-    invalid_baru = total_baru - valid_baru
-    
-    # Update angka statistik
-    stats["total_parsed"] += total_baru
-    stats["valid"] += valid_baru
-    stats["invalid"] += invalid_baru
-    
-    # Tambahkan semua ke history
-    stats["history"].extend(batch_results)
-    
-    # Potong array agar selalu maksimal 50 data terakhir (mencegah file membengkak)
-    if len(stats["history"]) > 50:
-        stats["history"] = stats["history"][-50:]
-        
-    # Simpan ke file cukup 1 kali saja
-    with open(STATS_FILE, "w") as f:
-        json.dump(stats, f)
-        
-def render_stats_dashboard(dark_mode=False):
+    get_store().record((item["sentence"], item["valid"]) for item in batch_results)
+
+def render_stats_dashboard(dark_mode=False, cache_stats=None):
+    # plotly cukup di-load saat halaman statistik dibuka
+    import plotly.express as px
+
     stats = load_stats()
     
     st.markdown("### 📊 Statistik Penggunaan")
@@ -83,4 +44,17 @@ def render_stats_dashboard(dark_mode=False):
     if stats["history"]:
         df_hist = pd.DataFrame(stats["history"])
         df_hist = df_hist.iloc[::-1] # Reverse order
-        st.dataframe(df_hist, use_container_width=True)
\ No newline at end of file
+        st.dataframe(df_hist, use_container_width=True)
+
+    # cache_stats: {nama cache: LRUCache.stats()} — berlaku untuk proses server ini
+    if cache_stats:
+        st.markdown("#### ⚡ Cache Server")
+        for name, info in cache_stats.items():
+            lookups = info["hits"] + info["misses"]
+            hit_rate = f"{info['hits'] / lookups:.0%}" if lookups else "-"
+            st.caption(f"**{name}**")
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Hit", info["hits"])
+            c2.metric("Miss", info["misses"])
+            c3.metric("Hit Rate", hit_rate)
+            c4.metric("Isi", f"{info['size']} / {info['maxsize']}")
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Penyimpanan statistik penggunaan (tanpa Streamlit).
+
+- Tiap kalimat yang dianalisis = satu baris di tabel `events` (append-only)
+- Tabel `totals` = agregat yang selalu ikut di-update dalam transaksi yang sama,
+  jadi dashboard cukup membaca satu baris, bukan menghitung ulang log
+- update_* hanya menaruh event di buffer memori; buffer ditulis ke SQLite
+  saat penuh (FLUSH_SIZE), setelah FLUSH_INTERVAL detik, atau saat proses keluar
+- SQLite mode WAL + busy timeout: aman dipakai beberapa sesi / proses sekaligus
+"""
+
+import atexit
+import json
+import sqlite3
+import sys
+import threading
+import time
+
+STATS_DB = "usage_stats.db"
+# File lama; isinya diimpor sekali saat database pertama kali dibuat
+LEGACY_STATS_FILE = "usage_stats.json"
+
+FLUSH_SIZE = 100
+FLUSH_INTERVAL = 5.0
+HISTORY_SIZE = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       REAL,
+    sentence TEXT NOT NULL,
+    valid    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id           INTEGER PRIMARY KEY CHECK (id = 1),
+    total_parsed INTEGER NOT NULL,
+    valid        INTEGER NOT NULL,
+    invalid      INTEGER NOT NULL
+);
+"""
+
+
+def _empty_stats():
+    return {"total_parsed": 0, "valid": 0, "invalid": 0, "history": []}
+
+
+class StatsStore:
+    """Event log + agregat di SQLite, dengan buffer tulis di memori."""
+
+    def __init__(self, path=STATS_DB, legacy_path=LEGACY_STATS_FILE,
+                 flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.executescript(_SCHEMA)
+                created = conn.execute(
+                    "INSERT OR IGNORE INTO totals (id, total_parsed, valid, invalid) VALUES (1, 0, 0, 0)"
+                ).rowcount
+                if created:
+                    self._import_legacy(conn)
+            self._ready = True
+        return conn
+
+    def _import_legacy(self, conn):
+        """Pindahkan angka + riwayat dari usage_stats.json (kalau ada) ke database baru."""
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        conn.execute(
+            "UPDATE totals SET total_parsed = ?, valid = ?, invalid = ? WHERE id = 1",
+            (legacy.get("total_parsed", 0), legacy.get("valid", 0), legacy.get("invalid", 0)),
+        )
+        conn.executemany(
+            "INSERT INTO events (ts, sentence, valid) VALUES (NULL, ?, ?)",
+            [(item["sentence"], int(bool(item["valid"]))) for item in legacy.get("history", [])],
+        )
+
+    def record(self, events):
+        """Tambahkan event (list of (kalimat, valid)) ke buffer; tidak menyentuh disk kecuali buffer penuh."""
+        now = time.time()
+        with self._lock:
+            self._pending.extend((now, sentence, int(bool(valid))) for sentence, valid in events)
+            full = len(self._pending) >= self.flush_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Tulis semua event di buffer dalam satu transaksi."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return
+
+        valid = sum(row[2] for row in pending)
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO events (ts, sentence, valid) VALUES (?, ?, ?)", pending)
+                    conn.execute(
+                        "UPDATE totals SET total_parsed = total_parsed + ?, valid = valid + ?, "
+                        "invalid = invalid + ? WHERE id = 1",
+                        (len(pending), valid, len(pending) - valid),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Jangan hilangkan event; coba lagi pada flush berikutnya
+            sys.stderr.write(f"WARNING: Could not write usage stats to {self.path}: {e}\n")
+            with self._lock:
+                self._pending[:0] = pending
+
+    def load(self, history_size=HISTORY_SIZE):
+        """Agregat + riwayat terakhir (terbaru di akhir), format sama dengan usage_stats.json lama."""
+        self.flush()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT total_parsed, valid, invalid FROM totals WHERE id = 1").fetchone()
+                history = conn.execute(
+                    "SELECT sentence, valid FROM events ORDER BY id DESC LIMIT ?", (history_size,)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            sys.stderr.write(f"WARNING: Could not read usage stats from {self.path}: {e}\n")
+            return _empty_stats()
+
+        stats = _empty_stats()
+        if row:
+            stats["total_parsed"], stats["valid"], stats["invalid"] = row
+        stats["history"] = [{"sentence": s, "valid": bool(v)} for s, v in reversed(history)]
+        return stats
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store():
+    """Store bersama untuk proses ini (buffer di-flush otomatis saat proses keluar)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = StatsStore()
+            atexit.register(_STORE.flush)
+        return _STORE